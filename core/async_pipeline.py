@@ -0,0 +1,207 @@
+import asyncio
+import inspect
+from utils.time_utils import DeadlineScheduler
+from .multicast_sender import open_udp_socket
+
+
+class AsyncDatagramSender(asyncio.DatagramProtocol):
+    """asyncio UDP sender for record packets.
+
+    sendto() on the datagram transport never blocks: packets the kernel cannot
+    take immediately are buffered by the transport, and drain() waits until that
+    buffer is below its high-water mark again.
+    """
+
+    def __init__(self, group, port, inter_packet_delay_ms=0.0):
+        self.address = (group, int(port))
+        self.inter_packet_delay_ms = inter_packet_delay_ms
+        self.transport = None
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.errors = 0
+        self.last_error = None
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def error_received(self, exc):
+        self.errors += 1
+        self.last_error = exc
+
+    def pause_writing(self):
+        self._can_write.clear()
+
+    def resume_writing(self):
+        self._can_write.set()
+
+    def send_packets(self, packets):
+        """Queue every packet on the transport. Returns the number of bytes sent."""
+        sent = 0
+        for p in packets:
+            self.transport.sendto(p, self.address)
+            sent += len(p)
+        self.bytes_sent += sent
+        self.packets_sent += len(packets)
+        return sent
+
+    async def send_record(self, packets):
+        """Send one record, paced by inter_packet_delay_ms, and wait for the transport
+        to accept more. Returns the number of bytes sent."""
+        if self.inter_packet_delay_ms > 0:
+            sent = 0
+            for p in packets:
+                sent += self.send_packets([p])
+                await asyncio.sleep(self.inter_packet_delay_ms / 1000.0)
+        else:
+            sent = self.send_packets(packets)
+        await self.drain()
+        return sent
+
+    async def drain(self):
+        await self._can_write.wait()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def open_datagram_sender(group, port, ttl=1, interface="0.0.0.0", inter_packet_delay_ms=0.0):
+    """Create an AsyncDatagramSender on the running loop with the multicast TTL set."""
+    sock = open_udp_socket(ttl, interface)
+    sock.setblocking(False)
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_datagram_endpoint(
+        lambda: AsyncDatagramSender(group, port, inter_packet_delay_ms), sock=sock)
+    return protocol
+
+
+async def open_destinations(destinations):
+    """One AsyncDatagramSender per core.models.Destination."""
+    return [await open_datagram_sender(d.group, d.port, d.ttl, d.interface, d.inter_packet_delay_ms)
+            for d in destinations]
+
+
+class AsyncRecordStream:
+    """One paced record stream (generation plus transmission) as an asyncio task.
+
+    The asyncio counterpart of the SeederThread/SenderThread pair: records are
+    generated on DeadlineScheduler deadlines, sent through every AsyncDatagramSender
+    in senders (all sharing the same packet views) and handed to observers.
+    Observers are called as observer(record_idx, record_time, packets) and may be
+    plain functions or coroutines; coroutines are awaited before the next record.
+    Many streams can share one event loop (see run_streams).
+
+    pause(), resume(), stop() and set_hz() must be called from the loop's thread.
+    """
+
+    def __init__(self, params_getter, seeding_engine, senders=(), dat_buffer=None, start_time=-900.0,
+                 end_time=1200.0, hz=2.0, catch_up="burst", on_error=None):
+        self.params_getter = params_getter
+        self.seeding_engine = seeding_engine
+        self.senders = list(senders)
+        self.dat_buffer = dat_buffer
+        self.start_time = start_time
+        self.end_time = end_time
+        self.hz = hz if hz > 0 else 1.0
+        self.scheduler = DeadlineScheduler(self.hz, policy=catch_up)
+        self.on_error = on_error  # Called with the message; without it errors propagate
+        self.observers = []
+        self.records_sent = 0
+        self.running = False
+        self._stopped = False
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    def add_observer(self, callback):
+        self.observers.append(callback)
+
+    def remove_observer(self, callback):
+        if callback in self.observers:
+            self.observers.remove(callback)
+
+    async def _wait_for(self, deadline):
+        clock = self.scheduler.clock
+        remaining = deadline - clock()
+        if remaining > self.scheduler.spin_threshold:
+            await asyncio.sleep(remaining - self.scheduler.spin_threshold)
+        # The loop timer is only millisecond-accurate; yield-spin the last stretch so
+        # other streams keep running while this one waits for its deadline
+        while clock() < deadline:
+            await asyncio.sleep(0)
+
+    async def run(self):
+        """Generate and send records until end_time or stop()."""
+        self.running = True
+        current_time = self.start_time
+        record_idx = 0
+        self.scheduler.reset()
+        try:
+            while not self._stopped and current_time <= self.end_time:
+                if not self._resumed.is_set():
+                    # Restart the schedule after a pause rather than bursting to catch up
+                    await self._resumed.wait()
+                    self.scheduler.reset()
+                    continue
+                time_increment = 1.0 / self.hz
+                steps, deadline = self.scheduler.advance()
+                if deadline is not None:
+                    await self._wait_for(deadline)
+                if self._stopped:
+                    break
+                if steps > 1:
+                    # Skip policy dropped missed slots: advance simulated time past them
+                    current_time += (steps - 1) * time_increment
+                    if current_time > self.end_time:
+                        break
+                try:
+                    buffer = self.seeding_engine.seed_record(self.params_getter(), current_time,
+                                                             self.dat_buffer, time_increment)
+                    packets = buffer.get_packets()
+                    if len(self.senders) == 1:
+                        await self.senders[0].send_record(packets)
+                    elif self.senders:
+                        await asyncio.gather(*(sender.send_record(packets) for sender in self.senders))
+                    if self.senders:
+                        self.records_sent += 1
+                    for observer in list(self.observers):
+                        result = observer(record_idx, current_time, packets)
+                        if inspect.isawaitable(result):
+                            await result
+                    del packets  # Release the record buffer for reuse
+                except Exception as e:
+                    if self.on_error is None:
+                        raise
+                    self.on_error(str(e))
+                record_idx += 1
+                current_time += time_increment
+        finally:
+            self.running = False
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def stop(self):
+        self._stopped = True
+        # Ensure we can exit even if paused
+        self._resumed.set()
+
+    def set_hz(self, hz):
+        """Update the transmission rate (records per second)."""
+        hz = float(hz)
+        if hz <= 0:
+            hz = 1.0
+        self.hz = hz
+        self.scheduler.set_hz(hz)
+
+    def set_catch_up(self, policy):
+        self.scheduler.set_policy(policy)
+
+
+async def run_streams(*streams):
+    """Run several record streams concurrently on the current event loop."""
+    await asyncio.gather(*(stream.run() for stream in streams))
@@ -0,0 +1,140 @@
+import os
+import struct
+import numpy as np
+from core.loader import parse_dat_header
+
+# Sidecar <capture>.idx: header, then one entry per record in file order
+INDEX_MAGIC = b"SIMIDX01"
+INDEX_HEADER = struct.Struct('<8sIQI')  # magic, record_length, data_offset, time_field_offset
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('time', '<f4')])  # Byte offset of the record, packet 0 timestamp
+FLUSH_ENTRIES = 256
+
+def index_path_for(capture_path):
+    return capture_path + ".idx"
+
+def capture_data_offset(capture_path):
+    """Offset of the first record: after the parameter header of a recorded .dat, else 0."""
+    if os.path.getsize(capture_path) == 0:
+        return 0
+    header = parse_dat_header(np.memmap(capture_path, dtype=np.uint8, mode="r"))
+    return 0 if header is None else header[3]
+
+
+class IndexWriter:
+    """Appends index entries while a capture is being written (see the multicast listener)."""
+
+    def __init__(self, path, record_length, data_offset=0, time_field_offset=24):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(INDEX_HEADER.pack(INDEX_MAGIC, record_length, data_offset, time_field_offset))
+        self._pending = []
+        self.count = 0
+
+    def append(self, offset, record_time):
+        self._pending.append((offset, record_time))
+        self.count += 1
+        if len(self._pending) >= FLUSH_ENTRIES:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.file.write(np.array(self._pending, dtype=INDEX_DTYPE).tobytes())
+            self._pending = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class CaptureIndex:
+    """Record number -> byte offset -> timestamp map of a capture, with binary-search lookup.
+
+    Captures are flat records (the listener's received.dat) or a recorded .dat
+    with its parameter header in front; data_offset is where the records start.
+    Timestamps are the float32 time field of packet 0 of each record.
+    """
+
+    def __init__(self, offsets, times, record_length, data_offset=0, time_field_offset=24):
+        self.offsets = offsets
+        self.times = times
+        self.record_length = record_length
+        self.data_offset = data_offset
+        self.time_field_offset = time_field_offset
+        # Time-sorted record numbers, only needed when the times are not already in order
+        # (e.g. a simulation reset during the capture)
+        self._order = None if len(times) < 2 or bool(np.all(times[1:] >= times[:-1])) else \
+            np.argsort(times, kind='stable')
+        # Held as float64 so searchsorted does not convert the whole array on every lookup
+        self._sorted_times = (times if self._order is None else times[self._order]).astype(np.float64)
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def build(cls, capture_path, packet_length=1400, packets_per_record=10, time_field_offset=24):
+        """Index an existing capture. Only the pages holding each record's time field are read."""
+        record_length = packet_length * packets_per_record
+        data_offset = capture_data_offset(capture_path)
+        n = max(0, os.path.getsize(capture_path) - data_offset) // record_length
+        offsets = data_offset + np.arange(n, dtype=np.uint64) * np.uint64(record_length)
+        if n:
+            data = np.memmap(capture_path, dtype=np.uint8, mode="r", offset=data_offset, shape=(n, record_length))
+            times = np.ascontiguousarray(data[:, time_field_offset:time_field_offset + 4]).view('<f4')[:, 0]
+        else:
+            times = np.zeros(0, dtype='<f4')
+        return cls(offsets, times, record_length, data_offset, time_field_offset)
+
+    @classmethod
+    def load(cls, index_path):
+        with open(index_path, "rb") as f:
+            head = f.read(INDEX_HEADER.size)
+            if len(head) < INDEX_HEADER.size:
+                raise ValueError(f"{index_path}: truncated index header")
+            magic, record_length, data_offset, time_field_offset = INDEX_HEADER.unpack(head)
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"{index_path}: not a capture index")
+            # A partly written final entry (capture still being recorded) is ignored
+            entries = np.fromfile(f, dtype=np.uint8)
+        entries = entries[:len(entries) - len(entries) % INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+        return cls(entries['offset'], entries['time'], record_length, data_offset, time_field_offset)
+
+    def save(self, index_path):
+        entries = np.empty(len(self), dtype=INDEX_DTYPE)
+        entries['offset'] = self.offsets
+        entries['time'] = self.times
+        with open(index_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.record_length, self.data_offset, self.time_field_offset))
+            f.write(entries.tobytes())
+
+    @classmethod
+    def open(cls, capture_path, packet_length=1400, packets_per_record=10, time_field_offset=24):
+        """The sidecar index of capture_path, rebuilt and saved if it is missing, for another
+        layout, or does not cover every complete record."""
+        index_path = index_path_for(capture_path)
+        record_length = packet_length * packets_per_record
+        try:
+            index = cls.load(index_path)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and index.record_length == record_length and \
+                index.time_field_offset == time_field_offset and \
+                len(index) == max(0, os.path.getsize(capture_path) - index.data_offset) // record_length:
+            return index
+        index = cls.build(capture_path, packet_length, packets_per_record, time_field_offset)
+        index.save(index_path)
+        return index
+
+    def find(self, t):
+        """Record number of the first record with a timestamp >= t (len(self) if none), by
+        binary search over the timestamps. With out-of-order timestamps, the earliest
+        record in time order is returned."""
+        i = int(np.searchsorted(self._sorted_times, t, side='left'))
+        if self._order is None or i == len(self):
+            return i
+        return int(self._order[i])
+
+    def offset_at(self, t):
+        """Byte offset of the record find(t) returns, or None past the last record."""
+        k = self.find(t)
+        return int(self.offsets[k]) if k < len(self) else None
@@ -1,77 +1,136 @@
 import csv
+import os
 import struct
+import numpy as np
 from core.models import Parameter
+from core.playback import DatPlayback
+from utils.log import get_logger
+
+log = get_logger("io")
+
+# .dat parameter header: u32 count, then per parameter u32 name length, UTF-8 name and
+# the fixed fields below, then DAT_SEPARATOR; background records follow
+DAT_COUNT = struct.Struct('<I')
+DAT_PARAM_FIELDS = struct.Struct('<3I4f3I')
+DAT_PARAM_DTYPE = np.dtype([('packet_id', '<u4'), ('offset', '<u4'), ('type_flag', '<u4'), ('min_v', '<f4'),
+                            ('max_v', '<f4'), ('freq', '<f4'), ('phase', '<f4'), ('samples_per_500ms', '<u4'),
+                            ('enabled', '<u4'), ('bit_width', '<u4')])
+DAT_SEPARATOR = b'END_PARAMS'
+
+def parse_dat_header(data):
+    """Locate and decode the parameter header at the start of a .dat file's bytes.
+
+    Returns (names, fields, entry_offsets, data_offset): the parameter names, a
+    DAT_PARAM_DTYPE array of their fixed fields decoded in one pass, the byte
+    offset of each entry and the offset of the first background record. Returns
+    None when the data has no well-formed header (an old-format file). Field
+    values are not checked here; see validate_dat_fields.
+    """
+    data = memoryview(data).cast('B')  # Cheap slicing, also over an np.memmap
+    size = len(data)
+    if size < DAT_COUNT.size:
+        return None
+    count = DAT_COUNT.unpack_from(data, 0)[0]
+    # Each entry takes at least its length word and fixed fields; rejects raw data quickly
+    if DAT_COUNT.size + count * (DAT_COUNT.size + DAT_PARAM_FIELDS.size) + len(DAT_SEPARATOR) > size:
+        return None
+    unpack_len = DAT_COUNT.unpack_from
+    entry_offsets = []
+    name_lengths = []
+    pos = DAT_COUNT.size
+    for _ in range(count):
+        name_len = unpack_len(data, pos)[0]
+        if pos + DAT_COUNT.size + name_len + DAT_PARAM_FIELDS.size > size:
+            return None
+        entry_offsets.append(pos)
+        name_lengths.append(name_len)
+        pos += DAT_COUNT.size + name_len + DAT_PARAM_FIELDS.size
+    if bytes(data[pos:pos + len(DAT_SEPARATOR)]) != DAT_SEPARATOR:
+        return None
+    entry_offsets = np.array(entry_offsets, dtype=np.int64)
+    name_lengths = np.array(name_lengths, dtype=np.int64)
+    raw = np.frombuffer(data, dtype=np.uint8, count=pos)
+    field_offsets = entry_offsets + DAT_COUNT.size + name_lengths
+    fields = raw[field_offsets[:, None] + np.arange(DAT_PARAM_FIELDS.size)].view(DAT_PARAM_DTYPE)[:, 0] \
+        if count else np.zeros(0, dtype=DAT_PARAM_DTYPE)
+    names = [bytes(data[o + DAT_COUNT.size:o + DAT_COUNT.size + n]) for o, n in zip(entry_offsets.tolist(),
+                                                                                   name_lengths.tolist())]
+    return names, fields, entry_offsets, pos + len(DAT_SEPARATOR)
+
+def validate_dat_fields(fields):
+    """Check decoded header fields in bulk. Returns {entry index: reason} for the bad entries."""
+    checks = [
+        (~np.isin(fields['type_flag'], (0, 1)), "type flag is not 0 (bit) or 1 (float)"),
+        (~np.isin(fields['samples_per_500ms'], (1, 5)), "samples per record is not 1 or 5"),
+        (~np.isin(fields['enabled'], (0, 1)), "enabled flag is not 0 or 1"),
+        ((fields['bit_width'] < 1) | (fields['bit_width'] > 64), "bit width is outside 1..64"),
+    ]
+    for name in ('min_v', 'max_v', 'freq', 'phase'):
+        checks.append((~np.isfinite(fields[name]), f"{name} is not a finite number"))
+    checks.append((fields['min_v'] > fields['max_v'], "min_v is greater than max_v"))
+    bad = {}
+    for mask, reason in checks:
+        for i in np.flatnonzero(mask).tolist():
+            bad.setdefault(i, reason)
+    return bad
+
 
 class Loader:
-    def load_dat(self, filepath):
-        with open(filepath, "rb") as f:
-            # Read parameter count
-            param_count_bytes = f.read(4)
-            if len(param_count_bytes) < 4:
-                # Old format file, read as binary data only
-                f.seek(0)
-                return f.read(1400 * 10)
-            
-            param_count = struct.unpack('<I', param_count_bytes)[0]
-            
-            # Read parameters
-            parameters = []
-            for _ in range(param_count):
-                # Read parameter name
-                name_len_bytes = f.read(4)
-                if len(name_len_bytes) < 4:
-                    break
-                name_len = struct.unpack('<I', name_len_bytes)[0]
-                name_bytes = f.read(name_len)
-                name = name_bytes.decode('utf-8')
-                
-                # Read parameter data
-                packet_id = struct.unpack('<I', f.read(4))[0]
-                offset = struct.unpack('<I', f.read(4))[0]
-                type_flag = struct.unpack('<I', f.read(4))[0]
-                dtype = "float" if type_flag == 1 else "bit"
-                min_v = struct.unpack('<f', f.read(4))[0]
-                max_v = struct.unpack('<f', f.read(4))[0]
-                freq = struct.unpack('<f', f.read(4))[0]
-                phase = struct.unpack('<f', f.read(4))[0]
-                samples_per_500ms = struct.unpack('<I', f.read(4))[0]
-                enabled_flag = struct.unpack('<I', f.read(4))[0]
-                enabled = enabled_flag == 1
-                bit_width = struct.unpack('<I', f.read(4))[0]
-                
-                param = Parameter(
-                    name=name,
-                    packet_id=packet_id,
-                    offset=offset,
-                    dtype=dtype,
-                    min_v=min_v,
-                    max_v=max_v,
-                    waveform="Sine",  # Default waveform
-                    freq=freq,
-                    phase=phase,
-                    samples_per_500ms=samples_per_500ms,
-                    enabled=enabled,
-                    enabled_in_graph=True,  # Enable graph display by default for DAT-loaded parameters
-                    start_time=-900.0,
-                    end_time=1200.0,
-                    bit_width=bit_width
-                )
-                parameters.append(param)
-            
-            # Read separator
-            separator = f.read(10)
-            if separator != b'END_PARAMS':
-                # Old format file, read as binary data only
-                f.seek(0)
-                return f.read(1400 * 10), []
-            
-            # Read binary data
-            binary_data = f.read()
-            
-            return binary_data, parameters
+    def load_dat(self, filepath, loop=True):
+        """Read a .dat file's embedded parameters and map its records for playback.
+
+        Returns (DatPlayback, parameters); files without a parameter header are
+        all record data and return the DatPlayback alone (too short for a header)
+        or with no parameters. loop chooses looping or holding the last record.
+        Header entries with invalid fields are skipped and logged with their
+        byte offsets.
+        """
+        if os.path.getsize(filepath) < DAT_COUNT.size:
+            # Old format file, binary data only
+            return DatPlayback(filepath, 0, loop)
+        header = parse_dat_header(np.memmap(filepath, dtype=np.uint8, mode="r"))
+        if header is None:
+            # Old format file, binary data only
+            return DatPlayback(filepath, 0, loop), []
+        names, fields, entry_offsets, data_offset = header
+        bad = validate_dat_fields(fields)
+        rows = []
+        values = fields.tolist()  # Python scalars, converted once for every entry
+        for i, (name, row) in enumerate(zip(names, values)):
+            try:
+                name = name.decode('utf-8')
+            except UnicodeDecodeError:
+                bad.setdefault(i, "name is not valid UTF-8")
+            if i in bad:
+                log.warning("%s: parameter entry %d at byte %d skipped: %s", filepath, i, entry_offsets[i], bad[i])
+                continue
+            packet_id, offset, type_flag, min_v, max_v, freq, phase, samples_per_500ms, enabled, bit_width = row
+            rows.append(dict(
+                name=name,
+                packet_id=packet_id,
+                offset=offset,
+                dtype="float" if type_flag == 1 else "bit",
+                min_v=min_v,
+                max_v=max_v,
+                waveform="Sine",  # Default waveform
+                freq=freq,
+                phase=phase,
+                samples_per_500ms=samples_per_500ms,
+                enabled=enabled == 1,
+                enabled_in_graph=True,  # Enable graph display by default for DAT-loaded parameters
+                start_time=-900.0,
+                end_time=1200.0,
+                bit_width=bit_width
+            ))
+        parameters = Parameter.from_dicts(rows)
+        if bad:
+            log.warning("%s: %d of %d parameter entries skipped", filepath, len(bad), len(names))
+        # Records follow the header; they are mapped, not read
+        return DatPlayback(filepath, data_offset, loop), parameters
 
     def load_csv(self, filepath):
         params = []
+        base_dir = os.path.dirname(os.path.abspath(filepath))
         with open(filepath, newline='') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -91,7 +150,18 @@ class Loader:
                     start_time=float(row.get("start_time", -900.0)),
                     end_time=float(row.get("end_time", 1200.0)),
                     fixed_value=float(row.get("fixed_value", 0.0)) if row.get("fixed_value") else None,
-                    bit_width=int(row.get("bit_width", 8))
+                    bit_width=int(row.get("bit_width", 8)),
+                    noise_type=row.get("noise_type") or "uniform",
+                    noise_sigma=float(row.get("noise_sigma") or 0.33),
+                    noise_cutoff=float(row.get("noise_cutoff") or 0.1),
+                    noise_seed=int(row["noise_seed"]) if row.get("noise_seed") else None,
+                    # Relative sample files are relative to the CSV file
+                    sample_file=os.path.join(base_dir, row["sample_file"]) if row.get("sample_file") else None,
+                    sample_rate=float(row.get("sample_rate") or 1.0),
+                    sample_start=float(row.get("sample_start") or 0.0),
+                    sample_interpolation=row.get("sample_interpolation") or "linear",
+                    sample_loop=(row.get("sample_loop") or "true").strip().lower() not in ("0", "false", "no"),
+                    sample_column=int(row.get("sample_column") or 0)
                 )
                 param.enabled = True
                 param.enabled_in_graph = True  # Enable graph display by default for CSV-loaded parameters
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import ClassVar
 
 @dataclass
 class Parameter:
@@ -9,7 +10,7 @@ class Parameter:
     dtype: str = "float"  # 'float' or 'bit'
     min_v: float = 0.0
     max_v: float = 1.0
-    waveform: str = "Sine"  # Sine, Triangle, Square, Step, Noise
+    waveform: str = "Sine"  # Sine, Triangle, Square, Step, Noise, Sampled
     freq: float = 1.0
     phase: float = 0.0
     full_sweep: bool = True
@@ -20,14 +21,50 @@ class Parameter:
     end_time: float = None
     fixed_value: float = None  # For major cycle
     bit_width: int = 8  # 8, 16, or 32 for digital parameters
+    noise_type: str = "uniform"  # Noise waveform: uniform, gaussian or band_limited
+    noise_sigma: float = 0.33  # Gaussian/band-limited standard deviation, as a fraction of the half range
+    noise_cutoff: float = 0.1  # Band-limited cutoff, as a fraction of the sample rate
+    noise_seed: int = None  # None uses the engine's noise seed
+    sample_file: str = None  # Sampled waveform: .npy or raw float32 file, values used as recorded
+    sample_rate: float = 1.0  # Samples per second in sample_file
+    sample_start: float = 0.0  # Record time of the file's first sample
+    sample_interpolation: str = "linear"  # nearest or linear
+    sample_loop: bool = True  # Loop past the end of the file, otherwise hold the first/last sample
+    sample_column: int = 0  # Column to replay from a 2-D .npy file
+
+    # Edits made to any Parameter after construction; a change tells SeedingEngine to
+    # re-check its compiled plan against the revisions of its own parameters
+    edits: ClassVar[int] = 0
+
+    def __post_init__(self):
+        object.__setattr__(self, "revision", 0)  # Attribute writes since construction
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if "revision" in self.__dict__:  # Writes made by __init__ are not edits
+            self.__dict__["revision"] += 1
+            Parameter.edits += 1
 
     def to_dict(self):
-        return vars(self)
+        return {k: v for k, v in vars(self).items() if k != "revision"}
 
     @classmethod
     def from_dict(cls, d):
         return cls(**d)
 
+    @classmethod
+    def from_dicts(cls, rows):
+        """Parameters from many dicts of field values at once, for large parameter sets.
+        Same result as from_dict per row."""
+        defaults = vars(cls())
+        params = []
+        for row in rows:
+            param = object.__new__(cls)
+            param.__dict__.update(defaults)
+            param.__dict__.update(row)
+            params.append(param)
+        return params
+
 class ParameterList:
     def __init__(self):
         self.parameters = []
@@ -59,4 +96,41 @@ class RecordSpec:
     packets_per_record: int = 10
     timestamp_packet_id: int = 0
     timestamp_offset: int = 24  # 7th float slot (6*4=24)
-    timestamp_format: str = '>f'  # big-endian float
\ No newline at end of file
+    timestamp_format: str = '>f'  # big-endian float
+
+@dataclass
+class Destination:
+    """One transmission target for the generated records."""
+    group: str = "239.0.0.1"
+    port: int = 12345
+    ttl: int = 1
+    interface: str = "0.0.0.0"  # Local interface address for outgoing multicast
+    inter_packet_delay_ms: float = 0.0  # Per-destination pacing between packets
+
+    def label(self):
+        return f"{self.group}:{self.port}"
+
+    def to_dict(self):
+        return vars(self)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+    @classmethod
+    def parse_list(cls, text, default_port=12345):
+        """Parse "group[:port], group[:port], ..." into Destinations."""
+        destinations = []
+        for entry in text.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            group, sep, port = entry.rpartition(":")
+            if not sep:
+                group, port = entry, default_port
+            if not group:
+                raise ValueError(f"Invalid destination: {entry!r}")
+            destinations.append(cls(group=group, port=int(port)))
+        if not destinations:
+            raise ValueError("No destination given")
+        return destinations
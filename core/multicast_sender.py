@@ -1,20 +1,139 @@
+import ctypes
+import ctypes.util
+import errno
+import os
 import socket
+import sys
 import time
+import numpy as np
+
+SENDMMSG_MAX_MESSAGES = 1024  # UIO_MAXIOV: the kernel sends at most this many messages per call
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IoVec)), ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [("sin_family", ctypes.c_ushort), ("sin_port", ctypes.c_uint16),
+                ("sin_addr", ctypes.c_uint8 * 4), ("sin_zero", ctypes.c_uint8 * 8)]
+
+
+def _load_sendmmsg():
+    """Return libc's sendmmsg, or None where it is unavailable (non-Linux, old libc)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        func = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    func.restype = ctypes.c_int
+    return func
+
+_sendmmsg = _load_sendmmsg()
+
+def _buffer_address(packet):
+    """Return (owner, address, length) for a packet; owner must stay referenced while
+    the address is in use. Writable buffers are shared, read-only ones are bytes."""
+    if not isinstance(packet, bytes):
+        try:
+            view = (ctypes.c_char * 0).from_buffer(packet)
+            return view, ctypes.addressof(view), memoryview(packet).nbytes
+        except TypeError:
+            packet = bytes(packet)
+    return packet, ctypes.cast(packet, ctypes.c_void_p).value, len(packet)
+
+
+def open_udp_socket(ttl=1, interface='0.0.0.0'):
+    """UDP socket with the multicast TTL and, unless it is 0.0.0.0, the outgoing interface set."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+    if interface and interface != '0.0.0.0':
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+    return sock
+
 
 class MulticastSender:
-    def __init__(self, group, port, ttl=1, interface='0.0.0.0'):
+    """UDP sender for record packets.
+
+    send_batch() hands a whole list of packets to the kernel with one sendmmsg()
+    call per 1024 packets on Linux, and falls back to one sendto() per packet
+    elsewhere or when batch is False.
+    """
+
+    def __init__(self, group, port, ttl=1, interface='0.0.0.0', batch=True):
         self.group = group
-        self.port = port
+        self.port = int(port)
         self.ttl = ttl
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, bytes([ttl]))
-        # Additional interface setup if needed
+        self.sock = open_udp_socket(ttl, interface)
+        self.address = (group, self.port)
+        self.batched = bool(batch) and _sendmmsg is not None
+        if self.batched:
+            self._sockaddr = _SockAddrIn(socket.AF_INET, socket.htons(self.port),
+                                         (ctypes.c_uint8 * 4)(*socket.inet_aton(socket.gethostbyname(group))))
+            self._capacity = 0
+            self._grow(64)
+
+    def _grow(self, count):
+        # Header arrays are reused between calls; every message carries one iovec
+        self._capacity = count
+        self._iov = (_IoVec * count)()
+        self._iov_table = np.frombuffer(self._iov, dtype=np.uintp).reshape(count, 2)
+        self._msgs = (_MMsgHdr * count)()
+        for i in range(count):
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._sockaddr)
+            hdr.msg_namelen = ctypes.sizeof(self._sockaddr)
+            hdr.msg_iov = ctypes.pointer(self._iov[i])
+            hdr.msg_iovlen = 1
 
     def send_packets(self, packets, inter_packet_delay_ms=0):
+        """Send one packet at a time, optionally paced. Returns the number of bytes sent."""
+        sent = 0
         for p in packets:
-            self.sock.sendto(p, (self.group, self.port))
+            sent += self.sock.sendto(p, self.address)
             if inter_packet_delay_ms > 0:
                 time.sleep(inter_packet_delay_ms / 1000.0)
+        return sent
+
+    def send_batch(self, packets):
+        """Send every packet, batched where possible. Returns the number of bytes sent."""
+        if not packets:
+            return 0
+        if not self.batched:
+            return sum(self.sock.sendto(p, self.address) for p in packets)
+        if len(packets) > self._capacity:
+            self._grow(len(packets))
+        # Point the reusable iovecs straight at the packet buffers, without copying
+        owners, addresses, lengths = zip(*map(_buffer_address, packets))
+        count = len(owners)
+        self._iov_table[:count, 0] = addresses
+        self._iov_table[:count, 1] = lengths
+        fd = self.sock.fileno()
+        sent = 0
+        while sent < count:
+            n = _sendmmsg(fd, ctypes.addressof(self._msgs) + sent * ctypes.sizeof(_MMsgHdr),
+                          min(count - sent, SENDMMSG_MAX_MESSAGES), 0)
+            if n < 0:
+                err = ctypes.get_errno()
+                if err == errno.EINTR:
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += n
+        return sum(lengths)
 
     def close(self):
-        self.sock.close()
\ No newline at end of file
+        self.sock.close()
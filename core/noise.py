@@ -0,0 +1,106 @@
+import zlib
+import numpy as np
+
+NOISE_TYPES = ("uniform", "gaussian", "band_limited")
+BLOCK_RECORDS = 64  # Records of noise drawn per block
+FIR_TAPS = 63  # Band-limited filter length (odd, so the filter is symmetric)
+_BLOCKS_KEPT = 2  # Stacked blocks a NoiseBank keeps (the current and the previous one)
+
+def stream_id_for(name):
+    """Stable per-parameter stream number (unlike hash(), identical in every process)."""
+    return zlib.crc32(name.encode("utf-8"))
+
+def lowpass_taps(cutoff, taps=FIR_TAPS):
+    """Hamming-windowed sinc low-pass FIR; cutoff is a fraction of the sample rate (0, 0.5].
+    Scaled so filtered unit-variance white noise keeps unit variance."""
+    cutoff = min(max(float(cutoff), 1e-3), 0.5)
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return h / np.sqrt(np.sum(h * h))
+
+
+class NoiseStream:
+    """Reproducible noise for one parameter, drawn in blocks of BLOCK_RECORDS records.
+
+    Block b of a stream always comes from default_rng([seed, stream_id, b]), so
+    any record can be regenerated on its own: sequential GUI runs, chunked
+    headless renders and parallel workers all produce the same values for the
+    same record index. Values are normalised to [-1, 1] like the other waveforms.
+    """
+
+    def __init__(self, seed, stream_id, samples_per_record=1, noise_type="uniform", sigma=0.33, cutoff=0.1):
+        if noise_type not in NOISE_TYPES:
+            raise ValueError(f"Unknown noise type: {noise_type}")
+        self.seed = int(seed)
+        self.stream_id = int(stream_id)
+        self.samples_per_record = int(samples_per_record)
+        self.noise_type = noise_type
+        self.sigma = float(sigma)
+        self.taps = lowpass_taps(cutoff) if noise_type == "band_limited" else None
+        self._white_block = (None, None)  # Last white block drawn, reused as the next one's history
+
+    def _rng(self, block):
+        # SeedSequence entropy must be non-negative; negative blocks (negative times) wrap
+        return np.random.default_rng([self.seed, self.stream_id, block & 0xFFFFFFFFFFFFFFFF])
+
+    def _white(self, block):
+        if self._white_block[0] != block:
+            self._white_block = (block, self._rng(block).standard_normal(BLOCK_RECORDS * self.samples_per_record))
+        return self._white_block[1]
+
+    def block(self, block):
+        """Noise for records block*BLOCK_RECORDS ... as a (BLOCK_RECORDS, samples_per_record) array."""
+        size = BLOCK_RECORDS * self.samples_per_record
+        if self.noise_type == "uniform":
+            values = self._rng(block).uniform(-1.0, 1.0, size)
+        elif self.noise_type == "gaussian":
+            values = np.clip(self._rng(block).normal(0.0, self.sigma, size), -1.0, 1.0)
+        else:
+            # Filter continuously across the block boundary using the previous block's tail
+            history = len(self.taps) - 1
+            white = np.concatenate((self._white(block - 1)[-history:], self._white(block)))
+            values = np.clip(self.sigma * np.convolve(white, self.taps, mode="valid"), -1.0, 1.0)
+        return values.reshape(BLOCK_RECORDS, self.samples_per_record)
+
+    def samples(self, record_indices):
+        """Noise for each record index, shaped (n_records, samples_per_record)."""
+        record_indices = np.asarray(record_indices, dtype=np.int64)
+        blocks = record_indices // BLOCK_RECORDS
+        out = np.empty((len(record_indices), self.samples_per_record))
+        for block in np.unique(blocks):
+            sel = blocks == block
+            out[sel] = self.block(int(block))[record_indices[sel] - block * BLOCK_RECORDS]
+        return out
+
+
+class NoiseBank:
+    """NoiseStreams of several entries with the same samples per record.
+
+    Each block is drawn once for every stream and kept stacked, so consuming a
+    record is a single gather however many streams there are.
+    """
+
+    def __init__(self, streams):
+        self.streams = streams
+        self.samples_per_record = streams[0].samples_per_record if streams else 1
+        self._blocks = {}
+
+    def block(self, block):
+        """Noise of every stream for one block, shaped (BLOCK_RECORDS, n_streams, samples_per_record)."""
+        stacked = self._blocks.get(block)
+        if stacked is None:
+            stacked = np.stack([s.block(block) for s in self.streams], axis=1)
+            if len(self._blocks) >= _BLOCKS_KEPT:
+                self._blocks.pop(next(iter(self._blocks)))
+            self._blocks[block] = stacked
+        return stacked
+
+    def samples(self, record_indices):
+        """Noise shaped (n_records, n_streams, samples_per_record)."""
+        record_indices = np.asarray(record_indices, dtype=np.int64)
+        blocks = record_indices // BLOCK_RECORDS
+        out = np.empty((len(record_indices), len(self.streams), self.samples_per_record))
+        for block in np.unique(blocks):
+            sel = blocks == block
+            out[sel] = self.block(int(block))[record_indices[sel] - block * BLOCK_RECORDS]
+        return out
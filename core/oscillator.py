@@ -0,0 +1,123 @@
+import math
+import numpy as np
+from .waveform import TRIANGLE, SQUARE, STEP
+
+DEFAULT_TABLE_SIZE = 4096
+INTERPOLATIONS = ("linear", "nearest")
+# A record time further than this fraction of time_increment from the previous
+# record time plus time_increment is a jump (seek, pause, skip): phases resync
+RESYNC_TOLERANCE = 1e-6
+
+_tables = {}
+
+def sine_table(size):
+    """Shared read-only table of sin(2*pi*i/size), with a guard entry at i == size."""
+    table = _tables.get(size)
+    if table is None:
+        table = np.sin(2 * np.pi * np.arange(size + 1) / size)
+        table[size] = table[0]
+        table.setflags(write=False)
+        _tables[size] = table
+    return table
+
+def table_error(size, interpolation="linear"):
+    """Worst-case absolute error of a table lookup, for a [-1, 1] sine."""
+    if interpolation == "nearest":
+        return math.pi / size
+    return math.pi ** 2 / (2 * size * size)
+
+def table_size_for_error(max_error, interpolation="linear"):
+    """Smallest power-of-two table size whose worst-case error is at most max_error."""
+    if interpolation == "nearest":
+        size = math.pi / max_error
+    else:
+        size = math.pi / math.sqrt(2 * max_error)
+    return 1 << max(2, math.ceil(math.log2(size)))
+
+def wrap_cycles(cycles):
+    """Fractional part of a phase in cycles, always in [0, 1)."""
+    frac = cycles - np.floor(cycles)
+    return np.where(frac >= 1.0, 0.0, frac)
+
+
+class SineTable:
+    """Table-driven sine of a phase given in cycles."""
+
+    def __init__(self, size=DEFAULT_TABLE_SIZE, interpolation="linear"):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        self.size = int(size)
+        if self.size < 4:
+            raise ValueError("Sine table needs at least 4 entries")
+        self.interpolation = interpolation
+        self.table = sine_table(self.size)
+        self.max_error = table_error(self.size, interpolation)
+
+    def sin_cycles(self, cycles):
+        """sin(2*pi*cycles) for cycles in [0, 1)."""
+        pos = cycles * self.size
+        if self.interpolation == "nearest":
+            return self.table[np.rint(pos).astype(np.intp)]
+        i = pos.astype(np.intp)
+        lo = self.table[i]
+        return lo + (pos - i) * (self.table[i + 1] - lo)
+
+    def shape(self, code, cycles):
+        """Normalised [-1, 1] value of waveform code at cycles in [0, 1).
+
+        Square and Step follow the sign of the sine exactly as the direct
+        formulas do; Triangle rises over the first half cycle.
+        """
+        if code == TRIANGLE:
+            return np.where(cycles < 0.5, -1 + 4 * cycles, 3 - 4 * cycles)
+        if code == SQUARE:
+            return np.where(cycles <= 0.5, 1.0, -1.0)
+        if code == STEP:
+            return np.where((cycles > 0.0) & (cycles <= 0.5), 1.0, -1.0)
+        return self.sin_cycles(cycles)
+
+
+class PhaseAccumulator:
+    """Oscillator phases, in cycles, carried from record to record.
+
+    While records arrive time_increment apart each phase only advances by
+    freq * time_increment and wraps, so the per-record cost is constant and the
+    phase never depends on the magnitude of the record time. Any other jump
+    resyncs the phase from the record time itself.
+    """
+
+    def __init__(self, freq, phase_cycles):
+        self.freq = np.asarray(freq, dtype=np.float64)
+        self.phase_cycles = np.asarray(phase_cycles, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.cycles = None
+        self.last_time = None
+
+    def advance(self, record_times, time_increment):
+        """Return the phases at each record time as an (n_records, n_entries) array
+        in [0, 1), and keep the last row as the accumulator state."""
+        t = np.asarray(record_times, dtype=np.float64)
+        n = len(t)
+        if n == 0:
+            return np.zeros((0, len(self.freq)))
+        previous = np.empty(n)
+        previous[0] = np.nan if self.last_time is None else self.last_time
+        previous[1:] = t[:-1]
+        follows = np.abs(t - previous - time_increment) <= RESYNC_TOLERANCE * abs(time_increment)
+        # Rows that do not follow on are resynced from their own time; every other row
+        # counts steps from the last resynced row, or from the carried state if none
+        rows = np.arange(n)
+        anchor = np.maximum.accumulate(np.where(follows, -1, rows))
+        resynced = np.empty((n, len(self.freq)))
+        resync = ~follows
+        resynced[resync] = wrap_cycles(self.freq * t[resync, None] + self.phase_cycles)
+        anchored = anchor >= 0
+        state = self.cycles if self.cycles is not None else np.zeros(len(self.freq))
+        origin = np.where(anchored[:, None], resynced[np.maximum(anchor, 0)], state)
+        steps = np.where(anchored, rows - anchor, rows + 1)
+        cycles = wrap_cycles(origin + steps[:, None] * (self.freq * time_increment))
+        self.cycles = cycles[-1].copy()
+        self.last_time = t[-1]
+        return cycles
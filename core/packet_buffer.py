@@ -1,53 +1,99 @@
 import struct
 
+FLOAT_CODEC = struct.Struct('<f')
+UINT16_CODEC = struct.Struct('<H')
+UINT32_CODEC = struct.Struct('<I')
+UINT64_CODEC = struct.Struct('<Q')
+
+def packet_stride(packet_length):
+    """The packet length actually used on the wire: packet_length rounded up to a multiple of 4."""
+    packet_length = int(packet_length)
+    return packet_length + (-packet_length) % 4
+
 class PacketBuffer:
+    """One record held in a single contiguous bytearray.
+
+    Packets are exposed as memoryview slices of that buffer, so they can be
+    handed straight to sendto() without copying. While any of those slices is
+    alive the buffer reports in_use() and must not be rewritten.
+    """
+
     def __init__(self, packet_length=1400, packets_per_record=10, time_field_offset=24):
-        self.packet_length = int(packet_length)
-        if self.packet_length % 4 != 0:
-            self.packet_length += (4 - self.packet_length % 4)
+        self.packet_length = packet_stride(packet_length)
         self.packets_per_record = int(packets_per_record)
         self.time_field_offset = int(time_field_offset)
-        self.reset()
+        self.data = bytearray(self.packet_length * self.packets_per_record)
+        self.seeded_with = None  # (plan, template) last written by SeedingEngine, for reuse
+        self.samples = None  # SampleBlock of the values last seeded by SeedingEngine
 
     def reset(self):
-        self.buffers = [bytearray(self.packet_length) for _ in range(self.packets_per_record)]
+        self.data[:] = bytes(len(self.data))
+
+    def load(self, background):
+        """Fill the record from background bytes, truncating or zero-padding to the record size."""
+        n = min(len(background), len(self.data))
+        self.data[:n] = memoryview(background)[:n]
+        if n < len(self.data):
+            self.data[n:] = bytes(len(self.data) - n)
+
+    def _offset(self, packet_id, offset, size):
+        if 0 <= packet_id < self.packets_per_record and offset + size <= self.packet_length:
+            return packet_id * self.packet_length + offset
+        return None
 
     def insert_float(self, packet_id, offset, value):
-        if 0 <= packet_id < self.packets_per_record and offset + 4 <= self.packet_length:
-            self.buffers[packet_id][offset:offset+4] = struct.pack('<f', float(value))
-            return True
-        return False
+        pos = self._offset(packet_id, offset, 4)
+        if pos is None:
+            return False
+        FLOAT_CODEC.pack_into(self.data, pos, float(value))
+        return True
 
     def insert_uint8(self, packet_id, offset, value):
-        if 0 <= packet_id < self.packets_per_record and offset < self.packet_length:
-            self.buffers[packet_id][offset] = value & 0xFF
-            return True
-        return False
+        pos = self._offset(packet_id, offset, 1)
+        if pos is None:
+            return False
+        self.data[pos] = value & 0xFF
+        return True
 
     def insert_uint16(self, packet_id, offset, value):
-        if 0 <= packet_id < self.packets_per_record and offset + 2 <= self.packet_length:
-            self.buffers[packet_id][offset:offset+2] = struct.pack('<H', value & 0xFFFF)
-            return True
-        return False
+        pos = self._offset(packet_id, offset, 2)
+        if pos is None:
+            return False
+        UINT16_CODEC.pack_into(self.data, pos, value & 0xFFFF)
+        return True
 
     def insert_uint32(self, packet_id, offset, value):
-        if 0 <= packet_id < self.packets_per_record and offset + 4 <= self.packet_length:
-            self.buffers[packet_id][offset:offset+4] = struct.pack('<I', value & 0xFFFFFFFF)
-            return True
-        return False
+        pos = self._offset(packet_id, offset, 4)
+        if pos is None:
+            return False
+        UINT32_CODEC.pack_into(self.data, pos, value & 0xFFFFFFFF)
+        return True
 
     def insert_uint64(self, packet_id, offset, value):
-        if 0 <= packet_id < self.packets_per_record and offset + 8 <= self.packet_length:
-            self.buffers[packet_id][offset:offset+8] = struct.pack('<Q', value & 0xFF)
-            return True
-        return False
+        pos = self._offset(packet_id, offset, 8)
+        if pos is None:
+            return False
+        UINT64_CODEC.pack_into(self.data, pos, value & 0xFF)
+        return True
 
     def set_record_time(self, record_time):
-        b = struct.pack('<f', float(record_time))
         # Store timestamp once per record at absolute offset 24,
         # which corresponds to packet 0 at offset time_field_offset
-        if self.buffers and self.time_field_offset + 4 <= self.packet_length:
-            self.buffers[0][self.time_field_offset:self.time_field_offset+4] = b
+        if self.packets_per_record and self.time_field_offset + 4 <= self.packet_length:
+            FLOAT_CODEC.pack_into(self.data, self.time_field_offset, float(record_time))
 
     def get_packets(self):
-        return [bytes(b) for b in self.buffers]
\ No newline at end of file
+        """Return the packets as zero-copy memoryview slices of the record buffer."""
+        view = memoryview(self.data)
+        return [view[i * self.packet_length:(i + 1) * self.packet_length]
+                for i in range(self.packets_per_record)]
+
+    def in_use(self):
+        """True while any view returned by get_packets() is still referenced."""
+        # A bytearray refuses to resize while buffer exports exist
+        try:
+            self.data.append(0)
+        except BufferError:
+            return True
+        self.data.pop()
+        return False
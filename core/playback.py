@@ -0,0 +1,84 @@
+import os
+import numpy as np
+
+class DatPlayback:
+    """Background records streamed from a memory-mapped .dat file.
+
+    The bytes after the file's header (data_offset) are a sequence of records
+    of the engine's record length; record k of a run is used as the background
+    of the k-th record after the playback's start time. Past the last record
+    playback either loops or holds the last record. Nothing is read until a
+    record is used, so captures larger than memory can be replayed. A trailing
+    partial record is zero-padded.
+    """
+
+    def __init__(self, path, data_offset=0, loop=True, start_time=None):
+        self.path = path
+        self.data_offset = int(data_offset)
+        size = max(0, os.path.getsize(path) - self.data_offset)
+        # np.memmap cannot map zero bytes
+        self.data = np.memmap(path, dtype=np.uint8, mode="r", offset=self.data_offset) if size else np.zeros(0, np.uint8)
+        self.loop = loop
+        self.start_time = start_time  # None: anchored at the first record time requested
+        self._last = None  # (index, record_length, record) most recently returned by record()
+
+    def __len__(self):
+        return len(self.data)
+
+    def rewind(self, start_time=None):
+        """Start playback from the first record again, at start_time (or the next record requested)."""
+        self.start_time = start_time
+
+    def record_count(self, record_length):
+        return -(-len(self.data) // record_length)
+
+    def index(self, record_times, time_increment):
+        """File record number used for each record time."""
+        record_times = np.asarray(record_times, dtype=np.float64)
+        if self.start_time is None and record_times.size:
+            self.start_time = float(record_times.min())
+        if time_increment > 0:
+            k = np.round((record_times - self.start_time) / time_increment).astype(np.int64)
+        else:
+            k = np.zeros(record_times.shape, dtype=np.int64)
+        return k
+
+    def _wrap(self, k, record_length):
+        n = self.record_count(record_length)
+        return np.mod(k, n) if self.loop else np.clip(k, 0, n - 1)
+
+    def record(self, k, record_length):
+        """Background bytes of playback record k as a uint8 array of record_length bytes.
+
+        Returns the same array while k maps to the same file record, so unchanged
+        backgrounds are recognised by identity."""
+        if not len(self.data):
+            k = -1
+        else:
+            k = int(self._wrap(k, record_length))
+        if self._last is not None and self._last[:2] == (k, record_length):
+            return self._last[2]
+        if k < 0:
+            record = np.zeros(record_length, dtype=np.uint8)
+        else:
+            record = self.data[k * record_length:(k + 1) * record_length]
+            if len(record) < record_length:
+                record = np.concatenate((record, np.zeros(record_length - len(record), dtype=np.uint8)))
+        self._last = (k, record_length, record)
+        return record
+
+    def records(self, k, record_length, out):
+        """Copy the backgrounds of playback records k into out, a (len(k), record_length) uint8 array."""
+        if not len(self.data):
+            out[:] = 0
+            return out
+        k = self._wrap(np.asarray(k, dtype=np.int64), record_length)
+        full = len(self.data) // record_length
+        whole = k < full
+        if whole.all():
+            # One gather over the mapped records
+            out[:] = self.data[:full * record_length].reshape(full, record_length)[k]
+        else:
+            for i in range(len(k)):
+                out[i] = self.record(k[i], record_length)
+        return out
@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+from queue import Queue, Empty, Full
+from core.loader import DAT_COUNT, DAT_PARAM_FIELDS, DAT_SEPARATOR
+from utils.log import get_logger
+
+log = get_logger("recorder")
+
+BATCH_BYTES = 4 * 1024 * 1024  # Records gathered into one write
+IOV_MAX = 1024  # Buffers per os.writev call (the POSIX minimum for IOV_MAX)
+
+def encode_dat_header(params):
+    """The .dat parameter header Loader.load_dat reads: count, each parameter's name and
+    fixed fields, then the separator."""
+    parts = [DAT_COUNT.pack(len(params))]
+    for p in params:
+        name = p.name.encode('utf-8')
+        parts.append(DAT_COUNT.pack(len(name)))
+        parts.append(name)
+        parts.append(DAT_PARAM_FIELDS.pack(int(p.packet_id), int(p.offset), 1 if p.dtype == "float" else 0,
+                                           float(p.min_v), float(p.max_v), float(p.freq), float(p.phase),
+                                           int(p.samples_per_500ms), 1 if p.enabled else 0, int(p.bit_width)))
+    parts.append(DAT_SEPARATOR)
+    return b"".join(parts)
+
+def _write_all(fd, chunks):
+    """Write every chunk to fd, vectored where the platform has os.writev."""
+    if not hasattr(os, "writev"):
+        data = b"".join(chunks)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        return
+    for start in range(0, len(chunks), IOV_MAX):
+        pending = [memoryview(c) for c in chunks[start:start + IOV_MAX]]
+        while pending:
+            n = os.writev(fd, pending)
+            # Drop what a short write completed and retry the rest
+            while pending and n >= len(pending[0]):
+                n -= len(pending[0])
+                pending.pop(0)
+            if pending and n:
+                pending[0] = pending[0][n:]
+
+
+class DatRecorder:
+    """Tees generated records into .dat files on a background writer thread.
+
+    enqueue() has the signature of SenderThread.enqueue and of AsyncRecordStream
+    observers, copies the record and returns at once; it never blocks the
+    generating thread. When the queue is full the record is dropped and counted
+    in `dropped`. The writer gathers queued records into batches of about
+    BATCH_BYTES and writes each batch with one vectored write.
+
+    Every file starts with the parameter header, so each can be loaded on its
+    own. With rotate_bytes or rotate_seconds a new file is started, between two
+    records, once the current one would exceed the size or has been open that
+    long. Rotated files are named <stem>_0000<ext>, <stem>_0001<ext>, ...
+    """
+
+    def __init__(self, path, params, rotate_bytes=None, rotate_seconds=None, max_queue_records=8192,
+                 batch_bytes=BATCH_BYTES):
+        self.path = path
+        self.header = encode_dat_header(params)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.batch_bytes = batch_bytes
+        self.queue = Queue(maxsize=max_queue_records)
+        self.files = []  # Every file written, in order
+        self.records_written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.error = None
+        self._fd = None
+        self._file_bytes = 0
+        self._file_opened = 0.0
+        self._thread = None
+
+    def _file_name(self, number):
+        if self.rotate_bytes is None and self.rotate_seconds is None:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_{number:04d}{ext or '.dat'}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="DatRecorder", daemon=True)
+        self._thread.start()
+        return self
+
+    def enqueue(self, record_idx, record_time, packets):
+        try:
+            self.queue.put_nowait(b"".join(packets))
+        except Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Write everything queued so far, close the file and end the writer thread."""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self.dropped:
+            log.warning("%s: %d records dropped (writer fell behind)", self.path, self.dropped)
+        log.info("%s: %d records (%d bytes) in %d file(s)", self.path, self.records_written, self.bytes_written,
+                 len(self.files))
+
+    def _open_next(self):
+        self._close()
+        name = self._file_name(len(self.files))
+        self._fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        self.files.append(name)
+        _write_all(self._fd, [self.header])
+        self._file_bytes = len(self.header)
+        self._file_opened = time.monotonic()
+
+    def _close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _rotate_due(self, pending, next_size):
+        """Whether the next record must start a new file, with pending bytes not yet written."""
+        if self._fd is None:
+            return True
+        size = self._file_bytes + pending
+        if size == len(self.header):
+            return False  # At least one record per file
+        if self.rotate_bytes is not None and size + next_size > self.rotate_bytes:
+            return True
+        return self.rotate_seconds is not None and time.monotonic() - self._file_opened >= self.rotate_seconds
+
+    def _write_batch(self, records):
+        chunk = []
+        chunk_bytes = 0
+        for record in records:
+            if self._rotate_due(chunk_bytes, len(record)):
+                if chunk:
+                    self._flush(chunk, chunk_bytes)
+                    chunk, chunk_bytes = [], 0
+                self._open_next()
+            chunk.append(record)
+            chunk_bytes += len(record)
+        if chunk:
+            self._flush(chunk, chunk_bytes)
+
+    def _flush(self, chunk, chunk_bytes):
+        _write_all(self._fd, chunk)
+        self._file_bytes += chunk_bytes
+        self.records_written += len(chunk)
+        self.bytes_written += chunk_bytes
+
+    def _next_batch(self, first):
+        """Gather queued records behind first, up to batch_bytes, without blocking."""
+        batch = [first]
+        size = len(first)
+        while size < self.batch_bytes:
+            try:
+                item = self.queue.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            size += len(item)
+        return batch, False
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=0.1)
+                except Empty:
+                    if self.rotate_seconds is not None and self._fd is not None and self._rotate_due(0, 0):
+                        self._close()  # Idle past the rotation time: the next record starts a new file
+                    continue
+                if item is None:
+                    break
+                batch, stop = self._next_batch(item)
+                if self.error is None:
+                    try:
+                        self._write_batch(batch)
+                    except OSError as e:
+                        # Keep draining so the generating side never blocks; later records are lost
+                        self.error = str(e)
+                        log.error("%s: recording stopped: %s", self.path, e)
+                if stop:
+                    break
+        finally:
+            self._close()
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+from .seeder import SeedingEngine
+
+def record_times(start_time, end_time, hz):
+    """Record timestamps exactly as SeederThread produces them.
+
+    The seeder starts at start_time and keeps adding 1/hz while the time stays
+    <= end_time; the cumulative sum is sequential, so the float rounding matches.
+    """
+    if hz <= 0:
+        raise ValueError("hz must be positive")
+    if end_time < start_time:
+        return np.zeros(0, dtype=np.float64)
+    time_increment = 1.0 / hz
+    n = int((end_time - start_time) / time_increment) + 2
+    steps = np.full(n, time_increment, dtype=np.float64)
+    steps[0] = start_time
+    times = np.cumsum(steps)
+    return times[times <= end_time]
+
+
+class OfflineRenderer:
+    """Render a whole simulation window straight to a capture file at full CPU speed.
+
+    The capture is a flat concatenation of records (packets_per_record packets of
+    packet_length bytes each), the same layout the multicast listener writes to
+    received.dat.
+    """
+
+    def __init__(self, seeding_engine=None, chunk_records=2048):
+        self.seeding_engine = seeding_engine or SeedingEngine()
+        self.chunk_records = max(1, int(chunk_records))
+
+    def render(self, params, out_path, start_time=-900.0, end_time=1200.0, hz=2.0, dat_buffer=None,
+               progress=None):
+        """Write every record between start_time and end_time to out_path.
+
+        progress, if given, is called as progress(records_done, records_total) after
+        each chunk. Returns (records_written, bytes_written, elapsed_seconds).
+        """
+        engine = self.seeding_engine
+        times = record_times(start_time, end_time, hz)
+        time_increment = 1.0 / hz
+        chunk = np.empty((min(self.chunk_records, max(1, len(times))), engine.packets_per_record,
+                          engine.packet_length), dtype=np.uint8)
+        written = 0
+        started = time.perf_counter()
+        with open(out_path, "wb") as f:
+            for start in range(0, len(times), len(chunk)):
+                part = times[start:start + len(chunk)]
+                out = chunk[:len(part)]
+                engine.seed_records(params, part, dat_buffer, time_increment, out=out)
+                f.write(memoryview(out).cast('B'))
+                written += out.nbytes
+                if progress is not None:
+                    progress(start + len(part), len(times))
+        return len(times), written, time.perf_counter() - started
@@ -0,0 +1,78 @@
+import os
+import numpy as np
+
+INTERPOLATIONS = ("nearest", "linear")
+
+# Mapped sample files shared by every parameter and engine in the process
+_mapped = {}
+
+def map_samples(path):
+    """Memory-map a sample file: a .npy array (1-D, or 2-D with one column per channel)
+    or raw little-endian float32. Files are mapped once and shared; nothing is read
+    until samples are indexed."""
+    real = os.path.realpath(path)
+    stat = os.stat(real)
+    key = (real, stat.st_mtime_ns, stat.st_size)
+    data = _mapped.get(key)
+    if data is None:
+        if real.lower().endswith(".npy"):
+            data = np.load(real, mmap_mode="r")
+            if data.ndim not in (1, 2):
+                raise ValueError(f"{path}: expected a 1-D or 2-D array, got {data.ndim}-D")
+        else:
+            data = np.memmap(real, dtype="<f4", mode="r")
+        # A rewritten file gets a new key; drop the stale mapping
+        for old in [k for k in _mapped if k[0] == real]:
+            del _mapped[old]
+        _mapped[key] = data
+    return data
+
+
+class SampledSource:
+    """Values of one recorded channel at arbitrary times.
+
+    Sample i of the channel belongs to time start + i / rate. Between samples the
+    value is the nearest sample or a linear interpolation; outside the recording
+    it either loops or holds the first/last sample.
+    """
+
+    def __init__(self, path, rate=1.0, start=0.0, interpolation="linear", loop=True, column=0):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        if rate <= 0:
+            raise ValueError("Sample rate must be positive")
+        data = map_samples(path)
+        self.samples = data[:, column] if data.ndim == 2 else data
+        if len(self.samples) == 0:
+            raise ValueError(f"{path}: no samples")
+        self.rate = float(rate)
+        self.start = float(start)
+        self.interpolation = interpolation
+        self.loop = loop
+
+    def _index(self, i):
+        n = len(self.samples)
+        return np.mod(i, n) if self.loop else np.clip(i, 0, n - 1)
+
+    def values(self, t):
+        """Sample values at times t (any shape), as float64."""
+        n = len(self.samples)
+        pos = (np.asarray(t, dtype=np.float64) - self.start) * self.rate
+        if not self.loop:
+            pos = np.clip(pos, 0.0, n - 1)
+        if self.interpolation == "nearest":
+            # Fancy indexing reads only the pages holding the requested samples
+            return self.samples[self._index(np.floor(pos + 0.5).astype(np.int64))].astype(np.float64)
+        i = np.floor(pos).astype(np.int64)
+        w = pos - i
+        lo = self.samples[self._index(i)].astype(np.float64)
+        hi = self.samples[self._index(i + 1)].astype(np.float64)
+        return lo + w * (hi - lo)
+
+
+def source_for(param):
+    """SampledSource for a Parameter using the Sampled waveform."""
+    if not param.sample_file:
+        raise ValueError(f"{param.name}: Sampled waveform needs a sample_file")
+    return SampledSource(param.sample_file, param.sample_rate, param.sample_start, param.sample_interpolation, param.sample_loop,
+                         param.sample_column)
@@ -0,0 +1,382 @@
+import numpy as np
+from .noise import NoiseBank, NoiseStream, stream_id_for
+from .oscillator import PhaseAccumulator, wrap_cycles
+from .sampled import source_for
+from .waveform import evaluate_batch, waveform_code, NOISE, SAMPLED, TRIANGLE
+
+MINOR_SAMPLES = 5
+WRITES_KEPT = 8  # Active-entry patterns whose record writes a plan keeps
+GOLDEN_RATIO_FRAC = 0.61803398875
+
+# Wire encodings: numpy dtype, value mask applied to digital samples (None for floats)
+FLOAT32 = (np.dtype('<f4'), None)
+UINT8 = (np.dtype('<u1'), 0xFF)
+UINT16 = (np.dtype('<u2'), 0xFFFF)
+UINT32 = (np.dtype('<u4'), 0xFFFFFFFF)
+UINT64_LOW_BYTE = (np.dtype('<u8'), 0xFF)  # Digital minor: one uint64 slot per sub-sample, low byte only
+
+def _encoding_for(param):
+    if param.dtype == "float":
+        return FLOAT32
+    if param.samples_per_500ms != 1:
+        return UINT64_LOW_BYTE
+    if param.bit_width == 8:
+        return UINT8
+    if param.bit_width == 16:
+        return UINT16
+    return UINT32  # 32 bits
+
+
+class SeedPlan:
+    """Compiled seeding instructions for one parameter list and packet layout.
+
+    Built once whenever the parameter list changes. Waveform settings, seeding
+    windows and wire slots are held as NumPy arrays, so run() evaluates every
+    sample of a record in a few array operations and scatters the encoded bytes
+    into the record without per-parameter Python work.
+
+    With a sine_table (core.oscillator.SineTable) the periodic waveforms run as
+    table-driven oscillators: each entry's phase is accumulated from record to
+    record and read from the shared table instead of calling sin() on the
+    absolute record time.
+
+    Noise entries draw from per-parameter seeded streams indexed by record
+    number (record_time / time_increment), so the same seed, parameters and
+    record times give the same bytes however the records are batched.
+
+    Sampled entries read their memory-mapped sample files at the sample times.
+    """
+
+    def __init__(self, params, packet_length, packets_per_record, sine_table=None, noise_seed=0):
+        self.params = params  # Held so the list identity used as a cache key stays valid
+        self.packet_length = packet_length
+        self.packets_per_record = packets_per_record
+        enabled = [p for p in params if p.enabled]
+        self.names = [p.name for p in enabled]
+        self.param_index = np.array([i for i, p in enumerate(params) if p.enabled], dtype=np.intp)
+        self.graphed = np.array([p.enabled_in_graph for p in enabled], dtype=bool)
+
+        # Per-entry settings
+        self.kinds = np.array([waveform_code(p.waveform) for p in enabled], dtype=np.int8)
+        self.freq = np.array([p.freq for p in enabled], dtype=np.float64)
+        self.phase = np.array([p.phase for p in enabled], dtype=np.float64)
+        self.min_v = np.array([p.min_v for p in enabled], dtype=np.float64)
+        self.max_v = np.array([p.max_v for p in enabled], dtype=np.float64)
+        # A missing seeding window means the parameter is always active
+        self.start_time = np.array([-np.inf if p.start_time is None else p.start_time for p in enabled], dtype=np.float64)
+        self.end_time = np.array([np.inf if p.end_time is None else p.end_time for p in enabled], dtype=np.float64)
+        self.minor = np.array([p.samples_per_500ms != 1 for p in enabled], dtype=bool)
+        fixed = [p.fixed_value if (p.dtype == "float" and p.samples_per_500ms == 1) else None for p in enabled]
+        self.fixed_value = np.array([np.nan if v is None else v for v in fixed], dtype=np.float64)
+        self.has_fixed = ~np.isnan(self.fixed_value)
+        with np.errstate(divide='ignore'):
+            period = np.where(self.freq != 0.0, 1.0 / np.where(self.freq != 0.0, self.freq, 1.0), 0.0)
+        # ~1% of the waveform period, spread by the golden-ratio progression (none for noise,
+        # which is indexed by record, or recorded data)
+        self.minor_jitter = np.where((self.kinds == SAMPLED) | (self.kinds == NOISE), 0.0, period * 0.01)
+        self.sine_table = sine_table
+        self.accumulator = None
+        if sine_table is not None:
+            # Phase offsets in cycles; Triangle shifts by phase/(2*pi) seconds, the others by radians
+            turns = self.phase / (2 * np.pi)
+            self.accumulator = PhaseAccumulator(self.freq, np.where(self.kinds == TRIANGLE, self.freq * turns, turns))
+
+        # Per-sample layout, in entry order: one sample for major entries, five for minor
+        counts = np.where(self.minor, MINOR_SAMPLES, 1)
+        self.sample_entry = np.repeat(np.arange(len(enabled)), counts)
+        self.sample_start = np.concatenate(([0], np.cumsum(counts)))
+        self.counts = counts
+        # Sample times relative to the record time: a fraction of time_increment plus a
+        # share of the minor-cycle jitter
+        sub_sample = np.arange(len(self.sample_entry)) - self.sample_start[self.sample_entry]
+        self.sample_fraction = sub_sample / float(MINOR_SAMPLES)
+        self.sample_jitter = np.where(self.minor[self.sample_entry], self.minor_jitter[self.sample_entry], 0.0)
+
+        # Entries grouped by cycle type and waveform kind so each batch evaluation is homogeneous
+        self.groups = []
+        for minor in (False, True):
+            for code in np.unique(self.kinds[self.minor == minor]):
+                idx = np.flatnonzero((self.minor == minor) & (self.kinds == code))
+                if minor:
+                    cols = (self.sample_start[idx][:, None] + np.arange(MINOR_SAMPLES)).ravel()
+                else:
+                    cols = self.sample_start[idx]
+                self.groups.append((minor, idx, cols))
+        # Seeded noise streams, one bank per cycle type; sample file sources per entry
+        self.noise_banks = {}
+        self.sampled_sources = {}
+        for minor, idx, _ in self.groups:
+            if self.kinds[idx[0]] == NOISE:
+                self.noise_banks[minor] = NoiseBank([self._noise_stream(enabled[e], noise_seed) for e in idx])
+            elif self.kinds[idx[0]] == SAMPLED:
+                self.sampled_sources[minor] = [source_for(enabled[e]) for e in idx]
+        n_samples = len(self.sample_entry)
+        is_float = np.array([p.dtype == "float" for p in enabled], dtype=bool)
+        self.digital_samples = np.flatnonzero(~is_float[self.sample_entry])
+        self.threshold = ((self.min_v + self.max_v) / 2.0)[self.sample_entry[self.digital_samples]]
+
+        # Wire slots: every in-range sample contributes its encoded bytes at an absolute offset
+        # (packet_id * packet_length + offset). Out-of-range slots are dropped here instead of
+        # being bounds-checked per record. Slots are kept in entry order, which decides who
+        # wins where slots overlap.
+        encodings = {}  # (dtype, mask) -> index into self.encodings
+        slot_enc, slot_pos, slot_sample = [], [], []
+        for e, p in enumerate(enabled):
+            enc = _encoding_for(p)
+            size = enc[0].itemsize
+            stride = size if p.samples_per_500ms != 1 else 0
+            in_packet = 0 <= p.packet_id < packets_per_record
+            for i in range(counts[e]):
+                offset = p.offset + i * stride
+                if not in_packet or offset + size > packet_length:
+                    continue
+                slot_enc.append(encodings.setdefault(enc, len(encodings)))
+                slot_pos.append(p.packet_id * packet_length + offset)
+                slot_sample.append(self.sample_start[e] + i)
+        self.encodings = list(encodings)
+        itemsize = np.array([dtype.itemsize for dtype, _ in self.encodings], dtype=np.intp)
+        self.slot_enc = np.array(slot_enc, dtype=np.intp)
+        self.slot_pos = np.array(slot_pos, dtype=np.intp)
+        self.slot_sample = np.array(slot_sample, dtype=np.intp)
+        self.slot_size = itemsize[self.slot_enc]
+        self.slot_start = np.cumsum(self.slot_size) - self.slot_size
+        # Slots that can be written as one element of a typed view of the record
+        record_length = packet_length * packets_per_record
+        self.slot_aligned = (self.slot_pos % np.maximum(self.slot_size, 1) == 0) & \
+            (record_length % np.maximum(self.slot_size, 1) == 0)
+        # Per written byte, in slot order: its slot, byte within the slot and record offset
+        self.byte_slot = np.repeat(np.arange(len(slot_enc), dtype=np.intp), self.slot_size)
+        self.byte_k = np.arange(len(self.byte_slot)) - self.slot_start[self.byte_slot]
+        self.byte_pos = self.slot_pos[self.byte_slot] + self.byte_k
+        self.byte_entry = self.sample_entry[self.slot_sample[self.byte_slot]]
+        self.written_pos = np.unique(self.byte_pos)
+        self._writes = {}  # Active-entry pattern -> final writes (see _writes_for)
+        self.n_samples = n_samples
+
+    def _final_writes(self, active):
+        """The writes that seed a record whose active entries are `active`, one per encoding as
+        (dtype, mask, samples, elements, byte_samples, columns, offsets).
+
+        Every record byte is written once, by the last active slot covering it, so the
+        result is the same as writing the slots one after another in entry order. Whole
+        aligned slots are written as elements of a typed view of the record; slots partly
+        overwritten by a later one, or unaligned, are written byte by byte (byte `columns`
+        of the encoded byte_samples, at record `offsets`).
+        """
+        live = np.flatnonzero(active[self.byte_entry])
+        last = np.unique(self.byte_pos[live][::-1], return_index=True)[1]
+        winner = np.zeros(len(self.byte_pos), dtype=bool)
+        winner[live[len(live) - 1 - last]] = True
+        won = np.add.reduceat(winner.astype(np.intp), self.slot_start) if len(self.slot_start) else self.slot_start
+        typed = (won == self.slot_size) & self.slot_aligned
+        partial = winner & ~typed[self.byte_slot]
+        byte_enc = self.slot_enc[self.byte_slot]
+        writes = []
+        for i, (dtype, mask) in enumerate(self.encodings):
+            slots = np.flatnonzero(typed & (self.slot_enc == i))
+            parts = np.flatnonzero(partial & (byte_enc == i))
+            if len(slots) or len(parts):
+                writes.append((dtype, mask, self.slot_sample[slots], self.slot_pos[slots] // dtype.itemsize,
+                               self.slot_sample[self.byte_slot[parts]],
+                               np.arange(len(parts)) * dtype.itemsize + self.byte_k[parts], self.byte_pos[parts]))
+        return writes
+
+    def _writes_for(self, active):
+        """Cached _final_writes for one record's active entries (None: all active)."""
+        key = None if active is None else np.packbits(active).tobytes()
+        writes = self._writes.get(key)
+        if writes is None:
+            writes = self._final_writes(np.ones(len(self.names), dtype=bool) if active is None else active)
+            if len(self._writes) >= WRITES_KEPT:
+                self._writes.pop(next(iter(self._writes)))
+            self._writes[key] = writes
+        return writes
+
+    @staticmethod
+    def _noise_stream(param, noise_seed):
+        seed = noise_seed if param.noise_seed is None else param.noise_seed
+        samples = MINOR_SAMPLES if param.samples_per_500ms != 1 else 1
+        return NoiseStream(seed, stream_id_for(param.name), samples, param.noise_type, param.noise_sigma,
+                           param.noise_cutoff)
+
+    def evaluate(self, record_times, time_increment):
+        """Return every sample value for a batch of records as a (n_records, n_samples) float64
+        array, samples in entry order."""
+        record_times = np.asarray(record_times, dtype=np.float64)
+        n = len(record_times)
+        values = np.empty((n, self.n_samples), dtype=np.float64)
+        # Record number of each record time, used for the minor-cycle jitter and noise streams
+        if time_increment > 0:
+            k = np.round(record_times / time_increment)
+        else:
+            k = np.zeros(n)
+        if self.minor.any():
+            sample_spacing = time_increment / float(MINOR_SAMPLES)
+            golden_frac = np.mod(k * GOLDEN_RATIO_FRAC, 1.0)
+            minor_base = record_times[:, None] + np.arange(MINOR_SAMPLES) * sample_spacing
+        cycles = self.accumulator.advance(record_times, time_increment) if self.accumulator is not None else None
+        for minor, m, cols in self.groups:
+            code = self.kinds[m[0]]
+            if code == NOISE:
+                norm = self.noise_banks[minor].samples(k.astype(np.int64))
+                if not minor:
+                    wave = self.min_v[m] + (self.max_v[m] - self.min_v[m]) * (norm[:, :, 0] + 1) / 2
+                else:
+                    wave = self.min_v[m, None] + (self.max_v[m, None] - self.min_v[m, None]) * (norm + 1) / 2
+            elif code == SAMPLED:
+                # Recorded values are used as they are, not scaled into min_v..max_v
+                t = record_times if not minor else minor_base
+                wave = np.stack([source.values(t) for source in self.sampled_sources[minor]], axis=1)
+            elif cycles is not None:
+                if not minor:
+                    phase = cycles[:, m]
+                else:
+                    # Sub-sample offsets from the record time, advanced from the record's phase
+                    offset = (np.arange(MINOR_SAMPLES) * sample_spacing)[None, None, :] + \
+                        (self.minor_jitter[m][None, :] * (golden_frac[:, None] - 0.5))[:, :, None]
+                    phase = wrap_cycles(cycles[:, m, None] + self.freq[m, None] * offset)
+                lo = self.min_v[m] if not minor else self.min_v[m, None]
+                hi = self.max_v[m] if not minor else self.max_v[m, None]
+                wave = lo + (hi - lo) * (self.sine_table.shape(code, phase) + 1) / 2
+            elif not minor:
+                wave = evaluate_batch(self.kinds[m], self.freq[m], self.phase[m], self.min_v[m], self.max_v[m],
+                                      record_times[:, None])
+            else:
+                t = minor_base[:, None, :] + (self.minor_jitter[m][None, :] * (golden_frac[:, None] - 0.5))[:, :, None]
+                wave = evaluate_batch(self.kinds[m, None], self.freq[m, None], self.phase[m, None],
+                                      self.min_v[m, None], self.max_v[m, None], t)
+            if not minor:
+                values[:, cols] = np.where(self.has_fixed[m], self.fixed_value[m], wave) if self.has_fixed[m].any() else wave
+            else:
+                values[:, cols] = wave.reshape(n, -1)
+        if len(self.digital_samples):
+            # Digital samples toggle strictly between min_v and max_v around the midpoint
+            d = self.digital_samples
+            e = self.sample_entry[d]
+            values[:, d] = np.where(values[:, d] < self.threshold, self.min_v[e], self.max_v[e])
+        return values
+
+    @staticmethod
+    def _encode_values(v, dtype, mask):
+        if mask is None:
+            return v.astype(dtype, order='C')
+        return (np.trunc(v).astype(np.int64) & mask).astype(dtype, order='C')
+
+    def active(self, record_times):
+        """Entries whose seeding window covers each record time, shaped (n_records, n_entries)."""
+        record_times = np.asarray(record_times, dtype=np.float64)[:, None]
+        return (record_times >= self.start_time) & (record_times <= self.end_time)
+
+    def write_records(self, records, record_times, time_increment):
+        """Seed every parameter into records, a (n_records, record_length) uint8 array that
+        already holds the background and timestamps."""
+        if not self.n_samples or not len(records):
+            return
+        self._scatter(records, self.evaluate(record_times, time_increment), self.active(record_times))
+
+    def _scatter(self, records, values, active):
+        if active.all():
+            self._write(records, values, self._writes_for(None))
+            return
+        # Records with the same active entries share their writes; seeding windows make these
+        # runs of consecutive records
+        patterns = np.packbits(active, axis=1)
+        if len(patterns) == 1:
+            first, inverse = [0], np.zeros(1, dtype=np.intp)
+        else:
+            patterns = patterns.view(np.dtype((np.void, patterns.shape[1]))).ravel()
+            _, first, inverse = np.unique(patterns, return_index=True, return_inverse=True)
+        for j, row in enumerate(first):
+            writes = self._writes_for(active[row])
+            rows = np.flatnonzero(inverse == j)
+            if rows[-1] - rows[0] + 1 == len(rows):
+                run = slice(rows[0], rows[-1] + 1)
+                self._write(records[run], values[run], writes)
+            else:
+                part = records[rows]
+                self._write(part, values[rows], writes)
+                records[rows] = part
+
+    def _write(self, records, values, writes):
+        for dtype, mask, samples, elements, byte_samples, cols, offsets in writes:
+            if len(samples):
+                records.view(dtype)[:, elements] = self._encode_values(values[:, samples], dtype, mask)
+            if len(byte_samples):
+                records[:, offsets] = self._encode_values(values[:, byte_samples], dtype, mask).view(np.uint8)[:, cols]
+
+    def restore(self, record, template):
+        """Put the background back under every parameter slot of a reused record."""
+        if len(self.written_pos):
+            np.frombuffer(record, dtype=np.uint8)[self.written_pos] = template[self.written_pos]
+
+    def sample_times(self, record_time, time_increment):
+        """Time of every sample of one record, in entry order, matching evaluate()."""
+        k = round(record_time / time_increment) if time_increment > 0 else 0
+        golden_frac = (k * GOLDEN_RATIO_FRAC) % 1.0
+        return record_time + self.sample_fraction * time_increment + self.sample_jitter * (golden_frac - 0.5)
+
+    def run(self, record, record_time, time_increment):
+        """Write every active parameter into one record's contiguous, writable buffer and
+        return the written samples as a SampleBlock."""
+        if not self.n_samples:
+            return SampleBlock(record_time, self.param_index, [], self.graphed, self.sample_start,
+                               np.zeros(0), np.zeros(0))
+        active = self.active([record_time])
+        values = self.evaluate([record_time], time_increment)
+        self._scatter(np.frombuffer(record, dtype=np.uint8)[None, :], values, active)
+        times = self.sample_times(record_time, time_increment)
+        active = active[0]
+        if active.all():
+            return SampleBlock(record_time, self.param_index, self.names, self.graphed, self.sample_start,
+                               times, values[0])
+        # Entries outside their seeding window were not written and are left out
+        keep = active[self.sample_entry]
+        entries = np.flatnonzero(active)
+        return SampleBlock(record_time, self.param_index[entries], [self.names[e] for e in entries],
+                           self.graphed[entries], np.concatenate(([0], np.cumsum(self.counts[entries]))),
+                           times[keep], values[0][keep])
+
+
+class SampleBlock:
+    """The samples of one generated record, as they were written to the wire.
+
+    Entry i is parameter param_index[i] of the seeded list (named names[i]); its
+    samples are times/values[starts[i]:starts[i + 1]], one for a major-cycle
+    parameter and five for a minor-cycle one. Only parameters inside their
+    seeding window are included.
+    """
+
+    __slots__ = ("record_time", "param_index", "names", "graphed", "starts", "times", "values")
+
+    def __init__(self, record_time, param_index, names, graphed, starts, times, values):
+        self.record_time = record_time
+        self.param_index = param_index
+        self.names = names
+        self.graphed = graphed
+        self.starts = starts
+        self.times = times
+        self.values = values
+
+    def __len__(self):
+        return len(self.names)
+
+    def entries(self, graphed_only=False):
+        """Yield (name, times, values) per parameter: floats for major-cycle parameters,
+        lists of five for minor-cycle ones."""
+        times = self.times.tolist()
+        values = self.values.tolist()
+        starts = self.starts.tolist()
+        graphed = self.graphed.tolist()
+        for i, name in enumerate(self.names):
+            if graphed_only and not graphed[i]:
+                continue
+            lo, hi = starts[i], starts[i + 1]
+            if hi - lo == 1:
+                yield name, times[lo], values[lo]
+            else:
+                yield name, times[lo:hi], values[lo:hi]
+
+    def samples(self, i):
+        """Times and values of entry i as arrays."""
+        lo, hi = self.starts[i], self.starts[i + 1]
+        return self.times[lo:hi], self.values[lo:hi]
@@ -1,90 +1,174 @@
-from .packet_buffer import PacketBuffer
-from .waveform import make_waveform
-import math
-from PyQt5.QtCore import QObject, pyqtSignal
-
-class SeedingEngine(QObject):
-    sample_generated = pyqtSignal(str, object, float)  # param_name, value(s), time
-    
-    def __init__(self, packet_length=1400, packets_per_record=10, time_field_offset=24):
-        super().__init__()
-        self.packet_length = packet_length
+from .packet_buffer import PacketBuffer, packet_stride
+from .seed_plan import SeedPlan
+from .oscillator import SineTable
+from .models import Parameter
+from .playback import DatPlayback
+import numpy as np
+
+# Upper bound on samples evaluated per chunk in seed_records (keeps temporaries bounded)
+BATCH_SAMPLE_BUDGET = 2000000
+
+class SeedingEngine:
+    """Generates telemetry records from a parameter list. Has no Qt dependency.
+
+    Observers registered with add_observer() are called once per seed_record as
+    observer(record_time, samples), where samples is the record's
+    core.seed_plan.SampleBlock: the times and values written for every active
+    parameter. The same block is kept on the returned buffer as buffer.samples.
+    Qt code adapts this in threads.worker_signals.EngineSignals.
+
+    dat_buffer is either background bytes, used under every record, or a
+    core.playback.DatPlayback that supplies a different background per record.
+    """
+
+    def __init__(self, packet_length=1400, packets_per_record=10, time_field_offset=24, reuse_records=False,
+                 oscillator_table_size=None, oscillator_interpolation="linear", noise_seed=0):
+        # Packets are padded like PacketBuffer's, so the plan, seed_records and the senders
+        # all use the same layout
+        self.packet_length = packet_stride(packet_length)
         self.packets_per_record = packets_per_record
         self.time_field_offset = time_field_offset
+        # With oscillator_table_size, Sine/Triangle/Square/Step run as phase-accumulating
+        # table oscillators (see core.oscillator); None evaluates the direct formulas
+        self.sine_table = SineTable(oscillator_table_size, oscillator_interpolation) if oscillator_table_size else None
+        # Seed for Noise parameters without their own noise_seed; same seed, same bytes
+        self.noise_seed = noise_seed
+        # With reuse_records, seed_record recycles PacketBuffers once every packet view handed
+        # out by get_packets() has been released. Callers must hold the packets, not the buffer.
+        self.reuse_records = reuse_records
+        self._plan = None
+        self._plan_key = None
+        self._plan_edits = None
+        self._plan_members = []
+        self._template = None
+        self._template_key = None
+        self._template_source = None
+        self._pool = []
+        self._pool_cursor = 0
+        self._observers = []
+
+    def add_observer(self, callback):
+        """Register callback(record_time, samples), called from the generating thread with
+        each record's SampleBlock."""
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def remove_observer(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def plan_for(self, params):
+        """Return the compiled seed plan for params, recompiling only when they changed."""
+        key = (id(params), self.packet_length, self.packets_per_record, self.sine_table, self.noise_seed)
+        if self._plan is not None and key == self._plan_key:
+            if Parameter.edits == self._plan_edits:
+                return self._plan
+            # Some Parameter was edited: recompile only if it is one of ours
+            self._plan_edits = Parameter.edits
+            if self._plan_current(params):
+                return self._plan
+        self._plan_edits = Parameter.edits
+        self._plan = SeedPlan(params, self.packet_length, self.packets_per_record, self.sine_table,
+                              self.noise_seed)
+        self._plan_key = key
+        self._plan_members = [(p, p.revision) for p in params]
+        return self._plan
+
+    def _plan_current(self, params):
+        """Whether params still holds the plan's parameters, none edited since it was compiled."""
+        return len(params) == len(self._plan_members) and \
+            all(p is q and p.revision == r for p, (q, r) in zip(params, self._plan_members))
+
+    def template_for(self, dat_buffer=None):
+        """Return the cached background record for dat_buffer, rebuilding it only when the
+        buffer or the packet layout changes."""
+        key = (id(dat_buffer), self.packet_length, self.packets_per_record)
+        if self._template is None or key != self._template_key:
+            self._template = self.background_record(dat_buffer)
+            self._template_key = key
+            self._template_source = dat_buffer  # Held so the id() in the key stays valid
+        return self._template
+
+    def _next_buffer(self, plan, template):
+        if not self.reuse_records:
+            buffer = PacketBuffer(self.packet_length, self.packets_per_record, self.time_field_offset)
+            buffer.load(template)
+            return buffer
+        # Take the next pooled record nobody is still sending; grow the pool when all are busy
+        buffer = None
+        for i in range(len(self._pool)):
+            candidate = self._pool[(self._pool_cursor + i) % len(self._pool)]
+            if not candidate.in_use():
+                buffer = candidate
+                self._pool_cursor = (self._pool_cursor + i + 1) % len(self._pool)
+                break
+        if buffer is None:
+            buffer = PacketBuffer(self.packet_length, self.packets_per_record, self.time_field_offset)
+            self._pool.append(buffer)
+        if buffer.seeded_with is not None and buffer.seeded_with[0] is plan and buffer.seeded_with[1] is template:
+            # Same background and layout: only the parameter slots need restoring
+            plan.restore(buffer.data, template)
+        else:
+            buffer.load(template)
+            buffer.seeded_with = (plan, template)
+        return buffer
+
+    def background_for(self, dat_buffer, record_time, time_increment=1.0):
+        """Background of the record at record_time: the playback record it falls on, or the
+        cached template for static background bytes."""
+        if isinstance(dat_buffer, DatPlayback):
+            k = dat_buffer.index(record_time, time_increment)
+            return dat_buffer.record(k, self.packet_length * self.packets_per_record)
+        return self.template_for(dat_buffer)
 
     def seed_record(self, params, record_time, dat_buffer=None, time_increment=1.0):
-        buffer = PacketBuffer(self.packet_length, self.packets_per_record, self.time_field_offset)
+        plan = self.plan_for(params)
+        buffer = self._next_buffer(plan, self.background_for(dat_buffer, record_time, time_increment))
+        buffer.set_record_time(record_time)  # Write timer once per record (packet 0)
+        samples = plan.run(buffer.data, record_time, time_increment)
+        buffer.samples = samples
+        for observer in self._observers:
+            observer(record_time, samples)
+        return buffer
+
+    def background_record(self, dat_buffer=None):
+        """Return one record's background bytes (dat_buffer truncated/zero-padded) as a flat uint8 array."""
+        record_length = self.packet_length * self.packets_per_record
+        background = np.zeros(record_length, dtype=np.uint8)
         if dat_buffer is not None:
-            # Split dat_buffer into packets (1400 bytes each)
-            packets = []
-            for i in range(self.packets_per_record):
-                start_idx = i * self.packet_length
-                end_idx = start_idx + self.packet_length
-                if start_idx < len(dat_buffer):
-                    packet_data = dat_buffer[start_idx:end_idx]
-                    # Pad with zeros if packet is shorter than expected
-                    if len(packet_data) < self.packet_length:
-                        packet_data += b'\x00' * (self.packet_length - len(packet_data))
-                    packets.append(bytearray(packet_data))
-                else:
-                    # Create empty packet if dat_buffer is too short
-                    packets.append(bytearray(self.packet_length))
-            buffer.buffers = packets
+            data = np.frombuffer(dat_buffer, dtype=np.uint8, count=min(len(dat_buffer), record_length))
+            background[:len(data)] = data
+        return background
+
+    def seed_records(self, params, record_times, dat_buffer=None, time_increment=1.0, out=None):
+        """Generate many records in one vectorized pass.
+
+        Returns a (n_records, packets_per_record, packet_length) uint8 array holding the same
+        bytes seed_record would produce for each time. Pass out to reuse a preallocated array.
+        Observers are not called on this path.
+        """
+        record_times = np.asarray(record_times, dtype=np.float64).ravel()
+        n = len(record_times)
+        shape = (n, self.packets_per_record, self.packet_length)
+        if out is None:
+            out = np.empty(shape, dtype=np.uint8)
+        elif out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"out must be a uint8 array of shape {shape}")
+        records = out.reshape(n, -1)
+        if isinstance(dat_buffer, DatPlayback):
+            dat_buffer.records(dat_buffer.index(record_times, time_increment), records.shape[1], records)
         else:
-            buffer.reset()  # Use empty buffers when no .dat file is loaded
-        buffer.set_record_time(record_time)  # Write timer to all packets
-
-        for param in params:
-            if not param.enabled or record_time < param.start_time or record_time > param.end_time:
-                continue
-            if param.samples_per_500ms == 1:  # Major cycle
-                # Sample strictly at record_time (no phase offset)
-                sample_time = record_time
-                if param.dtype == "float":
-                    wf = make_waveform(param.waveform, param.freq, param.phase, param.full_sweep)
-                    # Use waveform value at sample_time; fall back to fixed_value if explicitly set
-                    value = param.fixed_value if param.fixed_value is not None else wf.value(sample_time, param.min_v, param.max_v)
-                    buffer.insert_float(param.packet_id, param.offset, value)
-                    if param.enabled_in_graph:
-                        self.sample_generated.emit(param.name, value, record_time)
-                else:  # Digital (bit) -> toggle strictly between min_v and max_v using waveform threshold
-                    wf = make_waveform(param.waveform, param.freq, param.phase, param.full_sweep)
-                    analog = wf.value(sample_time, param.min_v, param.max_v)
-                    threshold = (param.min_v + param.max_v) / 2.0
-                    value = param.min_v if analog < threshold else param.max_v
-                    if param.bit_width == 8:
-                        buffer.insert_uint8(param.packet_id, param.offset, int(value))
-                    elif param.bit_width == 16:
-                        buffer.insert_uint16(param.packet_id, param.offset, int(value))
-                    else:  # 32 bits
-                        buffer.insert_uint32(param.packet_id, param.offset, int(value))
-                    if param.enabled_in_graph:
-                        self.sample_generated.emit(param.name, value, record_time)
-            else:  # Minor cycle (5 samples)
-                wf = make_waveform(param.waveform, param.freq, param.phase, param.full_sweep)
-                sample_values = []
-                sample_spacing = time_increment / 5.0  # Spread 5 samples across the time increment
-                for i in range(5):
-                    # Deterministic non-repeating time adjustment independent of ΔT (tied to waveform period):
-                    # add a small phase-based time offset (~1% of the waveform period) using golden-ratio progression
-                    k = int(round(record_time / time_increment)) if time_increment > 0 else 0
-                    golden_frac = (k * 0.61803398875) % 1.0
-                    period = 1.0 / param.freq if getattr(param, 'freq', 0.0) not in (0.0, None) else 0.0
-                    phase_time_offset = (period * 0.01) * (golden_frac - 0.5) if period > 0.0 else 0.0
-                    sample_time = record_time + i * sample_spacing + phase_time_offset
-                    if param.dtype == "float":
-                        value = wf.value(sample_time, param.min_v, param.max_v)
-                        sample_values.append(value)
-                        offset = param.offset + (i * 4)
-                        buffer.insert_float(param.packet_id, offset, value)
-                    else:
-                        # Digital minor: still toggle min/max discretely at each sub-sample
-                        analog = wf.value(sample_time, param.min_v, param.max_v)
-                        threshold = (param.min_v + param.max_v) / 2.0
-                        value = param.min_v if analog < threshold else param.max_v
-                        sample_values.append(value)
-                        offset = param.offset + (i * 8)
-                        buffer.insert_uint64(param.packet_id, offset, int(value) & 0xFF)
-                if param.enabled_in_graph:
-                    self.sample_generated.emit(param.name, sample_values, record_time)
-        return buffer
\ No newline at end of file
+            records[:] = self.template_for(dat_buffer)
+
+        if self.time_field_offset + 4 <= self.packet_length:
+            # Timestamp lives once per record in packet 0
+            stamps = record_times.astype('<f4').view(np.uint8).reshape(n, 4)
+            records[:, self.time_field_offset:self.time_field_offset + 4] = stamps
+
+        plan = self.plan_for(params)
+        chunk = max(1, BATCH_SAMPLE_BUDGET // max(1, plan.n_samples))
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            plan.write_records(records[start:stop], record_times[start:stop], time_increment)
+        return out
+
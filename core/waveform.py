@@ -1,38 +1,86 @@
-import math
-import random
+import numpy as np
+from .sampled import source_for
+from .noise import NoiseStream, stream_id_for
 
-def make_waveform(waveform_type, freq, phase, full_sweep):
-    class BaseWaveform:
-        def value(self, t, min_v, max_v):
-            norm = self._compute(t)  # Returns [-1, 1]
-            return min_v + (max_v - min_v) * (norm + 1) / 2
+SINE, TRIANGLE, SQUARE, STEP, NOISE, SAMPLED = range(6)
+WAVEFORM_CODES = {
+    "Sine": SINE,
+    "Triangle": TRIANGLE,
+    "Square": SQUARE,
+    "Step": STEP,
+    "Noise": NOISE,
+    "Sampled": SAMPLED  # Evaluated by SeedPlan from the mapped file, not by evaluate_batch
+}
 
-    class Sine(BaseWaveform):
-        def _compute(self, t):
-            return math.sin(2 * math.pi * freq * t + phase)
+def waveform_code(waveform_type):
+    """Map a waveform name to its batch code (unknown names fall back to Sine)."""
+    return WAVEFORM_CODES.get(waveform_type, SINE)
 
-    class Triangle(BaseWaveform):
-        def _compute(self, t):
-            period = 1 / freq
-            frac = math.fmod(t + phase / (2 * math.pi), period) / period
-            return -1 + 4 * frac if frac < 0.5 else 3 - 4 * frac
+def evaluate_batch(kinds, freq, phase, min_v, max_v, t):
+    """Evaluate many waveforms in one pass.
 
-    class Square(BaseWaveform):
-        def _compute(self, t):
-            return math.copysign(1, math.sin(2 * math.pi * freq * t + phase))
+    kinds holds waveform codes; all arguments broadcast against each other, so
+    per-parameter 1-D arrays can be combined with a (n_params, n_samples) time
+    grid by passing them as column vectors. Each waveform is computed in [-1, 1]
+    and returned as float64 scaled to [min_v, max_v]. Noise is
+    not evaluated here: it comes from seeded streams (core.noise.NoiseStream).
+    """
+    kinds = np.asarray(kinds)
+    codes = np.unique(kinds)
+    if NOISE in codes:
+        raise ValueError("Noise waveforms are drawn from NoiseStream, not evaluate_batch")
+    freq = np.asarray(freq, dtype=np.float64)
+    kinds, freq, omega, phase, t = np.broadcast_arrays(kinds, freq, 2 * np.pi * freq,
+                                                       np.asarray(phase, dtype=np.float64),
+                                                       np.asarray(t, dtype=np.float64))
+    norm = np.empty(t.shape, dtype=np.float64)
+    # Each shape is only computed on the elements that use it; a single kind (SeedPlan's
+    # groups) needs no masking
+    for code in codes:
+        sel = Ellipsis if len(codes) == 1 else kinds == code
+        if code == TRIANGLE:
+            f, ph, tt = freq[sel], phase[sel], t[sel]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                period = 1 / f
+                frac = np.fmod(tt + ph / (2 * np.pi), period) / period
+            out = np.where(frac < 0.5, -1 + 4 * frac, 3 - 4 * frac)
+        else:
+            out = omega[sel] * t[sel]
+            out += phase[sel]
+            np.sin(out, out=out)
+            if code == SQUARE:
+                np.copysign(1.0, out, out=out)
+            elif code == STEP:
+                out = np.where(out > 0, 1.0, -1.0)
+        norm[sel] = out
 
-    class Step(BaseWaveform):
-        def _compute(self, t):
-            return 1 if math.sin(2 * math.pi * freq * t + phase) > 0 else -1
+    min_v = np.asarray(min_v, dtype=np.float64)
+    span = np.asarray(max_v, dtype=np.float64) - min_v
+    if np.broadcast_shapes(min_v.shape, span.shape, norm.shape) != norm.shape:
+        return min_v + span * (norm + 1) / 2
+    # Same arithmetic, in place
+    norm += 1
+    norm *= span
+    norm /= 2
+    norm += min_v
+    return norm
 
-    class Noise(BaseWaveform):
-        def _compute(self, t):
-            return random.uniform(-1, 1)
+def evaluate_param(param, t, noise_seed=0):
+    """Values of one Parameter at times t (any shape) in a single vectorized pass.
 
-    return {
-        "Sine": Sine,
-        "Triangle": Triangle,
-        "Square": Square,
-        "Step": Step,
-        "Noise": Noise
-    }.get(waveform_type, Sine)()
\ No newline at end of file
+    Periodic waveforms go through evaluate_batch and Sampled reads its file at
+    t. Noise is drawn from the parameter's seeded stream, one value per element
+    of t (the engine draws one per record), so it shows the noise's character
+    rather than the values of particular records. noise_seed is the engine's
+    seed (SeedingEngine.noise_seed), used when the parameter has none.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if param.waveform == "Sampled":
+        return source_for(param).values(t)
+    if param.waveform == "Noise":
+        seed = noise_seed if param.noise_seed is None else param.noise_seed
+        stream = NoiseStream(seed, stream_id_for(param.name), 1, param.noise_type,
+                             param.noise_sigma, param.noise_cutoff)
+        norm = stream.samples(np.arange(t.size))[:, 0].reshape(t.shape)
+        return param.min_v + (param.max_v - param.min_v) * (norm + 1) / 2
+    return evaluate_batch(waveform_code(param.waveform), param.freq, param.phase, param.min_v, param.max_v, t)
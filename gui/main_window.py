@@ -1,16 +1,26 @@
 from PyQt5.QtWidgets import (QMainWindow, QSplitter, QHBoxLayout, QVBoxLayout, QWidget, 
                              QGroupBox, QPushButton, QLineEdit, QLabel, QFileDialog, 
-                             QSpinBox, QComboBox, QGridLayout, QTextEdit)
-from PyQt5.QtCore import Qt
+                             QSpinBox, QComboBox, QGridLayout)
+from PyQt5.QtCore import Qt, QTimer
 from gui.widgets.param_table import ParameterTableWidget
 from gui.widgets.waveform_plot import WaveformPlotWidget
+from gui.widgets.log_view import LogViewWidget
 from gui.parameter_editor import ParameterEditorDialog
 from threads.seeder_thread import SeederThread
 from threads.sender_thread import SenderThread
+from threads.async_pipeline_thread import AsyncPipelineThread
+from threads.worker_signals import EngineSignals
 from core.seeder import SeedingEngine
 from core.loader import Loader
+from core.recorder import DatRecorder
 from utils.config import ConfigManager
-from core.models import Parameter
+from core.models import Parameter, Destination
+from utils.log import get_logger
+import logging
+
+log = get_logger("gui")
+
+DEFAULT_FPS = 30  # Display refresh rate; records arriving between frames are coalesced
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -18,14 +28,24 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Telemetry Simulator")
         self.parameters = []
         self.dat_buffer = None
+        self.recorder = None  # DatRecorder teeing generated records to disk while Record is on
         self.seeder_thread = None
-        self.sender_thread = None
-        self.seeding_engine = SeedingEngine()
+        self.sender_threads = []  # One per destination, all fed the same records
+        self.destinations = []  # Destinations loaded from a config, keeping their TTL/interface/pacing
+        self.seeding_engine = SeedingEngine(reuse_records=True)
+        self.engine_signals = EngineSignals(self.seeding_engine)
         self.loader = Loader()
         self.config_manager = ConfigManager()
+        # Display state ingested from the threads, drawn by on_render_frame
+        self._pending_samples = None  # Newest SampleBlock not yet shown in the table
+        self._pending_time = None
+        self._pending_records = None
+        self.render_timer = QTimer(self)
         self.setup_ui()
         self.connect_signals()
         self.apply_grey_theme()
+        self._apply_fps_from_ui()
+        self.render_timer.start()
 
     def setup_ui(self):
         central = QWidget()
@@ -42,6 +62,9 @@ class MainWindow(QMainWindow):
         self.export_btn = QPushButton("Export Config")
         self.load_btn = QPushButton("Load Config")
         self.browse_btn = QPushButton("Browse File")
+        self.record_btn = QPushButton("Record")
+        self.record_btn.setCheckable(True)
+        self.record_btn.setToolTip("Record every generated record to a .dat file")
         
         top_bar.addWidget(self.start_btn)
         top_bar.addWidget(self.pause_btn)
@@ -50,6 +73,7 @@ class MainWindow(QMainWindow):
         top_bar.addWidget(self.export_btn)
         top_bar.addWidget(self.load_btn)
         top_bar.addWidget(self.browse_btn)
+        top_bar.addWidget(self.record_btn)
         main_lay.addLayout(top_bar)
 
         # Top Panes (QGridLayout)
@@ -69,6 +93,16 @@ class MainWindow(QMainWindow):
         self.hz_combo.addItems(["1", "2", "5", "10", "50"])
         self.hz_combo.setCurrentText("2")
         time_lay.addWidget(self.hz_combo)
+        time_lay.addWidget(QLabel("Display FPS:"))
+        self.fps_combo = QComboBox()
+        self.fps_combo.addItems(["10", "20", "30", "60"])
+        self.fps_combo.setCurrentText(str(DEFAULT_FPS))
+        time_lay.addWidget(self.fps_combo)
+        time_lay.addWidget(QLabel("DAT Playback:"))
+        self.dat_mode_combo = QComboBox()
+        self.dat_mode_combo.addItems(["Loop", "Hold Last"])
+        self.dat_mode_combo.setToolTip("After the last background record of the .dat file, loop or hold the last record")
+        time_lay.addWidget(self.dat_mode_combo)
         time_group.setLayout(time_lay)
         top_panes.addWidget(time_group, 0, 0)
 
@@ -90,10 +124,15 @@ class MainWindow(QMainWindow):
         net_lay = QVBoxLayout()
         net_lay.addWidget(QLabel("Multicast IP:"))
         self.multicast_ip_edit = QLineEdit("239.0.0.1")
+        self.multicast_ip_edit.setToolTip("One or more destinations, comma separated: group[:port], ...")
         net_lay.addWidget(self.multicast_ip_edit)
         net_lay.addWidget(QLabel("Port:"))
         self.port_edit = QLineEdit("12345")
         net_lay.addWidget(self.port_edit)
+        net_lay.addWidget(QLabel("Runtime:"))
+        self.runtime_combo = QComboBox()
+        self.runtime_combo.addItems(["QThreads", "asyncio"])
+        net_lay.addWidget(self.runtime_combo)
         net_group.setLayout(net_lay)
         top_panes.addWidget(net_group, 0, 2)
 
@@ -106,7 +145,7 @@ class MainWindow(QMainWindow):
         # Left: Parameter table with controls
         left_widget = QWidget()
         left_lay = QVBoxLayout()
-        self.param_table = ParameterTableWidget()
+        self.param_table = ParameterTableWidget(self.parameters)
         left_lay.addWidget(self.param_table)
         
         # Parameter controls
@@ -135,10 +174,9 @@ class MainWindow(QMainWindow):
         right_widget.setLayout(right_lay)
         splitter.addWidget(right_widget)
 
-        # Bottom: Log view
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
-        main_lay.addWidget(self.log)
+        # Bottom: Log view (bounded, filtered by level, appended once per frame)
+        self.log_view = LogViewWidget()
+        main_lay.addWidget(self.log_view)
 
     def apply_grey_theme(self):
         """Apply grey color scheme to UI elements"""
@@ -243,7 +281,7 @@ class MainWindow(QMainWindow):
                 color: #ffffff;
                 font-weight: bold;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #3c3c3c;
                 border: 1px solid #555555;
                 border-radius: 3px;
@@ -274,6 +312,7 @@ class MainWindow(QMainWindow):
         self.pause_btn.clicked.connect(self.on_pause)
         self.resume_btn.clicked.connect(self.on_resume)
         self.stop_btn.clicked.connect(self.on_reset)
+        self.record_btn.toggled.connect(self.on_record_toggled)
         self.export_btn.clicked.connect(self.on_export_config)
         self.load_btn.clicked.connect(self.on_load_config)
         self.browse_btn.clicked.connect(self.on_browse_file)
@@ -283,45 +322,125 @@ class MainWindow(QMainWindow):
         self.graph_options_btn.clicked.connect(self.waveform_plot._show_graph_popup)
         # Propagate Hz changes dynamically
         self.hz_combo.currentTextChanged.connect(self.on_hz_changed)
+        # Real-time parameter updates arrive as one batch per record from the seeding engine
+        self.engine_signals.samples_generated.connect(self.on_samples_generated)
+        # Plot, table and labels repaint at a fixed rate, independent of the record rate
+        self.render_timer.timeout.connect(self.on_render_frame)
+        self.fps_combo.currentTextChanged.connect(self._apply_fps_from_ui)
+        self.dat_mode_combo.currentTextChanged.connect(self._apply_dat_mode_from_ui)
 
     def on_start(self):
         if not self.parameters:
-            self.log.append("No parameters loaded")
+            log.warning("No parameters loaded")
             return
         # Allow simulation to start even without .dat file when parameters are manually added
         if not self.dat_buffer:
-            self.log.append("No .dat file loaded - using empty buffers for simulation")
-        
-        ip = self.multicast_ip_edit.text()
-        port = int(self.port_edit.text())
-        self.sender_thread = SenderThread(group=ip, port=port)
-        self.sender_thread.start()
+            log.info("No .dat file loaded - using empty buffers for simulation")
         
+        try:
+            destinations = self._destinations_from_ui()
+        except ValueError as e:
+            log.error("Invalid destination: %s", e)
+            return
         start_time = float(self.start_time_edit.text())
         end_time = float(self.end_time_edit.text())
         hz = float(self.hz_combo.currentText())
-        
-        self.seeder_thread = SeederThread(
-            params_getter=lambda: self.parameters,
-            seeding_engine=self.seeding_engine,
-            dat_buffer=self.dat_buffer,
-            start_time=start_time,
-            end_time=end_time,
-            hz=hz
-        )
-        self.seeder_thread.record_ready.connect(self.sender_thread.enqueue)
+        if self.dat_buffer is not None:
+            # Background playback starts from the file's first record
+            self._apply_dat_mode_from_ui()
+            self.dat_buffer.rewind(start_time)
+
+        if self.runtime_combo.currentText() == "asyncio":
+            # One asyncio loop generates and sends; it stands in for both threads
+            self.seeder_thread = AsyncPipelineThread(
+                params_getter=lambda: self.parameters,
+                seeding_engine=self.seeding_engine,
+                destinations=destinations,
+                dat_buffer=self.dat_buffer,
+                start_time=start_time,
+                end_time=end_time,
+                hz=hz
+            )
+            self.seeder_thread.record_sent.connect(self.update_records_sent)
+        else:
+            # Records are generated once; every destination gets the same packet views
+            self.sender_threads = [SenderThread.for_destination(d) for d in destinations]
+            for sender_thread in self.sender_threads:
+                sender_thread.start()
+
+            self.seeder_thread = SeederThread(
+                params_getter=lambda: self.parameters,
+                seeding_engine=self.seeding_engine,
+                dat_buffer=self.dat_buffer,
+                start_time=start_time,
+                end_time=end_time,
+                hz=hz
+            )
+            for sender_thread in self.sender_threads:
+                self.seeder_thread.record_ready.connect(sender_thread.enqueue)
+                sender_thread.error.connect(self.on_thread_error)
+            self.sender_threads[0].record_sent.connect(self.update_records_sent)
+        if len(destinations) > 1:
+            log.info("Sending to %s", ", ".join(d.label() for d in destinations))
         self.seeder_thread.record_ready.connect(self.on_record_ready)
         self.seeder_thread.record_ready.connect(self.update_current_time)  # Update current time from seeder
-        self.seeder_thread.error.connect(self.log.append)
-        self.sender_thread.record_sent.connect(self.update_records_sent)
-        
-        # Connect seeding engine signals for real-time parameter updates
-        self.seeding_engine.sample_generated.connect(self.param_table.update_instantaneous)
+        self.seeder_thread.error.connect(self.on_thread_error)
+        if self.recorder is not None:
+            self._connect_recorder()
+
         # Reset live stats on start
         self.current_time_label.setText("Current Time: 0 sec")
         self.records_sent_label.setText("Records Sent: 0")
         self.seeder_thread.start()
 
+    def _destinations_from_ui(self):
+        """Destinations typed in the Multicast IP field; settings of matching configured
+        destinations (TTL, interface, pacing) are kept."""
+        configured = {(d.group, d.port): d for d in self.destinations}
+        destinations = Destination.parse_list(self.multicast_ip_edit.text(), int(self.port_edit.text()))
+        return [configured.get((d.group, d.port), d) for d in destinations]
+
+    def on_samples_generated(self, record_time, samples):
+        """Take one record's generated samples (a SampleBlock): the values and sample times
+        that were written to the wire. The plot keeps every sample; the table shows the
+        newest block at the next frame."""
+        self.waveform_plot.append_samples(samples)
+        self._pending_samples = samples
+
+    def on_render_frame(self):
+        """Repaint whatever arrived since the last frame; intermediate table values and
+        label updates are dropped."""
+        self.waveform_plot.render_frame()
+        if self._pending_samples is not None:
+            self.param_table.update_samples(self._pending_samples)
+            self._pending_samples = None
+        if self._pending_time is not None:
+            self.current_time_label.setText(f"Current Time: {self._pending_time:.1f} sec")
+            self._pending_time = None
+        if self._pending_records is not None:
+            self.records_sent_label.setText(f"Records Sent: {self._pending_records}")
+            self._pending_records = None
+        self.log_view.flush()
+
+    def closeEvent(self, event):
+        # The log handler is attached to the shared logger, not owned by the window
+        self.log_view.detach()
+        super().closeEvent(event)
+
+    def on_thread_error(self, msg):
+        log.error("%s", msg)
+
+    def _apply_fps_from_ui(self, _text=None):
+        try:
+            fps = float(self.fps_combo.currentText())
+        except ValueError:
+            fps = DEFAULT_FPS
+        self.render_timer.setInterval(max(1, int(round(1000.0 / max(fps, 1.0)))))
+
+    def _apply_dat_mode_from_ui(self, _text=None):
+        if self.dat_buffer is not None:
+            self.dat_buffer.loop = self.dat_mode_combo.currentText() == "Loop"
+
     def on_hz_changed(self, _text: str):
         """Update running/paused seeder thread when Hz selection changes."""
         self._apply_hz_from_ui()
@@ -340,9 +459,9 @@ class MainWindow(QMainWindow):
         """Pause both seeder and sender threads"""
         if self.seeder_thread:
             self.seeder_thread.pause()
-        if self.sender_thread:
-            self.sender_thread.pause()
-        self.log.append("Simulation paused")
+        for sender_thread in self.sender_threads:
+            sender_thread.pause()
+        log.info("Simulation paused")
 
     def on_resume(self):
         """Resume both seeder and sender threads"""
@@ -350,9 +469,49 @@ class MainWindow(QMainWindow):
             # Ensure latest Hz is applied before resuming
             self._apply_hz_from_ui()
             self.seeder_thread.resume()
-        if self.sender_thread:
-            self.sender_thread.resume()
-        self.log.append("Simulation resumed")
+        for sender_thread in self.sender_threads:
+            sender_thread.resume()
+        log.info("Simulation resumed")
+
+    def on_record_toggled(self, checked):
+        if not checked:
+            self._stop_recording()
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Record to .dat File", "recording.dat", "DAT Files (*.dat)")
+        if not filename:
+            self._set_record_checked(False)
+            return
+        try:
+            self.recorder = DatRecorder(filename, list(self.parameters)).start()
+        except Exception as e:
+            log.error("Cannot record to %s: %s", filename, e)
+            self._set_record_checked(False)
+            return
+        if self.seeder_thread:
+            self._connect_recorder()
+        log.info("Recording to %s", filename)
+
+    def _connect_recorder(self):
+        # Direct connection: the record is copied on the generating thread, which never waits
+        # on the GUI thread or the disk
+        self.seeder_thread.record_ready.connect(self.recorder.enqueue, Qt.DirectConnection)
+
+    def _set_record_checked(self, checked):
+        self.record_btn.blockSignals(True)
+        self.record_btn.setChecked(checked)
+        self.record_btn.blockSignals(False)
+
+    def _stop_recording(self):
+        if self.recorder is None:
+            return
+        if self.seeder_thread:
+            try:
+                self.seeder_thread.record_ready.disconnect(self.recorder.enqueue)
+            except TypeError:
+                pass
+        self.recorder.stop()  # Logs the totals
+        self.recorder = None
+        self._set_record_checked(False)
 
     def on_reset(self):
         """Reset the simulation to initial state"""
@@ -360,11 +519,17 @@ class MainWindow(QMainWindow):
         if self.seeder_thread:
             self.seeder_thread.stop()
             self.seeder_thread = None
-        if self.sender_thread:
-            self.sender_thread.stop()
-            self.sender_thread = None
+        self._stop_recording()
+        for sender_thread in self.sender_threads:
+            sender_thread.stop()
+            log.info("%s:%s: %d records, %d bytes sent", sender_thread.group, sender_thread.port,
+                     sender_thread.records_sent, sender_thread.total_bytes)
+        self.sender_threads = []
         
-        # Reset all counters and displays
+        # Reset all counters and displays, dropping anything not yet drawn
+        self._pending_samples = None
+        self._pending_time = None
+        self._pending_records = None
         self.current_time_label.setText("Current Time: 0 sec")
         self.records_sent_label.setText("Records Sent: 0")
         
@@ -372,13 +537,12 @@ class MainWindow(QMainWindow):
         self.waveform_plot.clear_plot()
         
         # Reset parameter table instantaneous values
-        for param in self.parameters:
-            self.param_table.update_instantaneous(param.name, 0.0, 0.0)
+        self.param_table.clear_values(0.0, 0.0)
         
         # Clear any pending events
         self.waveform_plot.processEvents()
         
-        self.log.append("Simulation reset to initial state")
+        log.info("Simulation reset to initial state")
 
     def on_export_config(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Save Config", "", "JSON Files (*.json)")
@@ -388,6 +552,10 @@ class MainWindow(QMainWindow):
                 "end_time": float(self.end_time_edit.text()),
                 "hz": float(self.hz_combo.currentText())
             }
+            try:
+                settings["destinations"] = [d.to_dict() for d in self._destinations_from_ui()]
+            except ValueError as e:
+                log.warning("Destinations not saved: %s", e)
             self.config_manager.save_config(filename, self.parameters, settings)
 
     def on_load_config(self):
@@ -400,9 +568,6 @@ class MainWindow(QMainWindow):
                 if params:
                     self.parameters = params
                     self.param_table.load_parameters(params)
-                    self.log.append(f"Loaded {filename} with {len(params)} parameters")
-                    for param in params:
-                        self.log.append(f"  - {param.name} (Packet {param.packet_id}, Offset {param.offset})")
                 
                 # Apply simulation settings to UI
                 if settings:
@@ -420,13 +585,26 @@ class MainWindow(QMainWindow):
                             # Add custom hz value if not in list
                             self.hz_combo.addItem(hz_text)
                             self.hz_combo.setCurrentText(hz_text)
+                    if settings.get('destinations'):
+                        self.destinations = [Destination.from_dict(d) for d in settings['destinations']]
+                        self.multicast_ip_edit.setText(", ".join(d.label() for d in self.destinations))
                     
-                    self.log.append(f"Applied simulation settings: start_time={settings.get('start_time')}, end_time={settings.get('end_time')}, hz={settings.get('hz')}")
-                
-                self.log.append(f"Config loaded successfully from {filename}")
-                
+                    log.debug("Applied simulation settings: start_time=%s, end_time=%s, hz=%s",
+                              settings.get('start_time'), settings.get('end_time'), settings.get('hz'))
+
+                log.info("Loaded config %s with %d parameters", filename, len(params) if params else 0)
+                if params:
+                    self._log_parameters(params)
+
             except Exception as e:
-                self.log.append(f"Error loading config: {str(e)}")
+                log.error("Error loading config: %s", e)
+
+    @staticmethod
+    def _log_parameters(params):
+        """Per-parameter detail of a load, at DEBUG only"""
+        if log.isEnabledFor(logging.DEBUG):
+            for param in params:
+                log.debug("  - %s (Packet %s, Offset %s)", param.name, param.packet_id, param.offset)
 
     def on_browse_file(self):
         filename, _ = QFileDialog.getOpenFileName(self, "Load .dat File", "", "DAT Files (*.dat)")
@@ -439,33 +617,33 @@ class MainWindow(QMainWindow):
                     if parameters:
                         self.parameters = parameters
                         self.param_table.load_parameters(parameters)
-                        self.log.append(f"Loaded {filename} with {len(parameters)} embedded parameters")
-                        for param in parameters:
-                            self.log.append(f"  - {param.name} (Packet {param.packet_id}, Offset {param.offset})")
+                        log.info("Loaded %s with %d embedded parameters", filename, len(parameters))
+                        self._log_parameters(parameters)
                     else:
-                        self.log.append(f"Loaded {filename} (no embedded parameters)")
+                        log.info("Loaded %s (no embedded parameters)", filename)
                 else:
                     # Old format, binary data only
                     self.dat_buffer = result
-                    self.log.append(f"Loaded {filename} (old format - no embedded parameters)")
-                    self.log.append("You can add parameters manually using the 'Add Parameter' button")
+                    log.info("Loaded %s (old format - no embedded parameters)", filename)
+                    log.info("You can add parameters manually using the 'Add Parameter' button")
+                self._apply_dat_mode_from_ui()
+                record_length = self.seeding_engine.packet_length * self.seeding_engine.packets_per_record
+                log.info("%s: %d background records", filename, self.dat_buffer.record_count(record_length))
             except Exception as e:
-                self.log.append(f"Error loading file: {str(e)}")
+                log.error("Error loading file: %s", e)
 
     def on_add_param(self):
         # Open parameter editor dialog for new parameter
-        dialog = ParameterEditorDialog(None, self)
+        dialog = ParameterEditorDialog(None, self, self.seeding_engine.noise_seed)
         if dialog.exec_() == ParameterEditorDialog.Accepted:
             # Create new parameter with edited values
             new_param = dialog.get_parameter()
             new_param.sl_no = len(self.parameters) + 1
             if not new_param.name:  # If no name provided, give a default
                 new_param.name = f"param_{len(self.parameters) + 1}"
-            self.parameters.append(new_param)
-            self.param_table.parameters_list = self.parameters  # Update reference
-            self.param_table.load_parameters(self.parameters)
-            print(f"DEBUG: Added parameter {new_param.name}, enabled_in_graph={new_param.enabled_in_graph}")
-            self.log.append(f"Added parameter: {new_param.name}")
+            self.param_table.add_parameter(new_param)  # Appends to self.parameters
+            log.debug("Added parameter %s, enabled_in_graph=%s", new_param.name, new_param.enabled_in_graph)
+            log.info("Added parameter: %s", new_param.name)
 
     def on_edit_param(self):
         # Get selected row
@@ -473,90 +651,41 @@ class MainWindow(QMainWindow):
         if current_row >= 0 and current_row < len(self.parameters):
             param = self.parameters[current_row]
             # Open parameter editor dialog
-            dialog = ParameterEditorDialog(param, self)
+            dialog = ParameterEditorDialog(param, self, self.seeding_engine.noise_seed)
             if dialog.exec_() == ParameterEditorDialog.Accepted:
                 # Update the parameter with edited values
                 edited_param = dialog.get_parameter()
-                self.parameters[current_row] = edited_param
-                self.param_table.load_parameters(self.parameters)
-                print(f"DEBUG: Updated parameter {edited_param.name}, enabled_in_graph={edited_param.enabled_in_graph}")
-                self.log.append(f"Updated parameter: {edited_param.name}")
+                self.param_table.replace_parameter(current_row, edited_param)
+                log.debug("Updated parameter %s, enabled_in_graph=%s", edited_param.name, edited_param.enabled_in_graph)
+                log.info("Updated parameter: %s", edited_param.name)
         else:
-            self.log.append("Please select a parameter to edit")
+            log.warning("Please select a parameter to edit")
 
     def on_remove_param(self):
         # Get selected row
         current_row = self.param_table.currentRow()
         if current_row >= 0 and current_row < len(self.parameters):
-            param = self.parameters.pop(current_row)
-            self.param_table.parameters_list = self.parameters  # Update reference
-            self.param_table.load_parameters(self.parameters)
-            self.log.append(f"Removed parameter: {param.name}")
+            param = self.param_table.remove_parameter(current_row)
+            log.info("Removed parameter: %s", param.name)
         else:
-            self.log.append("Please select a parameter to remove")
+            log.warning("Please select a parameter to remove")
 
     def on_record_ready(self, record_idx, record_time, packets):
-        # Get current time increment based on Hz setting
-        hz = float(self.hz_combo.currentText())
-        time_increment = 1.0 / hz
-        
-        # Update GUI with new record data - show ALL enabled parameters in graph
-        # (Don't filter by timing windows for graph display)
-        graph_params = [p for p in self.parameters if p.enabled_in_graph]
-        
-        # Debug output
-        if record_idx < 3:  # Only show first few records to avoid spam
-            print(f"DEBUG: Total parameters: {len(self.parameters)}")
+        # Debug output (first few records only)
+        if record_idx < 3 and log.isEnabledFor(logging.DEBUG):
+            graph_params = [p for p in self.parameters if p.enabled_in_graph]
+            log.debug("Total parameters: %d", len(self.parameters))
             for i, p in enumerate(self.parameters):
-                print(f"  Param {i}: {p.name}, enabled_in_graph={p.enabled_in_graph}, enabled={p.enabled}")
-            print(f"DEBUG: Graph params: {len(graph_params)}")
-            for p in graph_params:
-                print(f"  Graph param: {p.name}")
-            print(f"DEBUG: Graph param names: {[p.name for p in graph_params]}")
-            print(f"DEBUG: Graph param enabled_in_graph: {[p.enabled_in_graph for p in graph_params]}")
-        
-        self.waveform_plot.update_waveform(graph_params, record_time, time_increment)
-        # Reflect generated record count immediately for responsiveness
-        self.records_sent_label.setText(f"Records Sent: {record_idx + 1}")
-        
-        # Update parameter table with instantaneous values
-        for param in self.parameters:
-            if param.enabled:
-                from core.waveform import make_waveform
-                wf = make_waveform(param.waveform, param.freq, param.phase, param.full_sweep)
-                
-                # Enforce per-parameter timing window for UI updates as well
-                within_start = True if (param.start_time is None) else (record_time >= param.start_time)
-                within_end = True if (param.end_time is None) else (record_time <= param.end_time)
-                if not (within_start and within_end):
-                    continue
-
-                if param.samples_per_500ms == 1:  # Major cycle - single value
-                    if param.dtype == "float":
-                        # Use the actual waveform value at the instantaneous time
-                        value = wf.value(record_time, param.min_v, param.max_v)
-                    else:
-                        # Bit-major toggles strictly between min and max at instantaneous time
-                        analog = wf.value(record_time, param.min_v, param.max_v)
-                        threshold = (param.min_v + param.max_v) / 2.0
-                        value = param.min_v if analog < threshold else param.max_v
-                    self.param_table.update_instantaneous(param.name, value, record_time, time_increment)
-                else:  # Minor cycle - 5 samples without any phase-offset (display-only)
-                    sample_values = []
-                    sample_times = []
-                    sample_spacing = time_increment / 5.0
-                    for i in range(5):
-                        sample_time = record_time + i * sample_spacing
-                        sample_times.append(sample_time)
-                        value = wf.value(sample_time, param.min_v, param.max_v)
-                        sample_values.append(value)
-                    # Update table with all 5 values and explicit times
-                    self.param_table.update_instantaneous(param.name, sample_values, sample_times, time_increment)
+                log.debug("  Param %d: %s, enabled_in_graph=%s, enabled=%s", i, p.name, p.enabled_in_graph, p.enabled)
+            log.debug("Graph params: %s", [p.name for p in graph_params])
+
+        # Plot and table values arrive with the record's sample block (on_samples_generated);
+        # "Records Sent" follows record_sent (update_records_sent)
 
     def update_current_time(self, record_idx, record_time, packets):
-        """Update current time from seeder thread"""
-        self.current_time_label.setText(f"Current Time: {record_time:.1f} sec")
+        """Update current time from seeder thread (shown at the next frame)"""
+        self._pending_time = record_time
 
     def update_records_sent(self, record_idx, time):
-        """Update records sent count from sender thread"""
-        self.records_sent_label.setText(f"Records Sent: {record_idx + 1}")
\ No newline at end of file
+        """Update records sent count from sender thread (shown at the next frame)"""
+        self._pending_records = record_idx + 1
\ No newline at end of file
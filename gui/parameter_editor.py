@@ -1,14 +1,16 @@
 from PyQt5.QtWidgets import (QDialog, QTabWidget, QVBoxLayout, QWidget, QFormLayout, 
                              QLineEdit, QSpinBox, QComboBox, QCheckBox, QDoubleSpinBox, 
-                             QPushButton, QHBoxLayout, QGroupBox, QLabel)
+                             QPushButton, QHBoxLayout, QGroupBox, QLabel, QFileDialog)
+from PyQt5.QtCore import QTimer
 import math
 from core.models import Parameter
 
 class ParameterEditorDialog(QDialog):
-    def __init__(self, param=None, parent=None):
+    def __init__(self, param=None, parent=None, noise_seed=0):
         super().__init__(parent)
         self.setWindowTitle("Parameter Editor")
         self.param = param
+        self.noise_seed = noise_seed  # Engine seed, previewed for Noise without its own seed
         self.setModal(True)
         self.setup_ui()
         self.apply_grey_theme()
@@ -25,6 +27,14 @@ class ParameterEditorDialog(QDialog):
         self.setup_basic_tab()
         self.setup_waveform_tab()
         self.setup_timing_tab()
+
+        # Preview plot, created on first use and redrawn in place as fields change
+        self.preview = None
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(30)  # Coalesce bursts of edits (typing, spin box repeat)
+        self.preview_timer.timeout.connect(self._refresh_preview)
+        self._connect_preview_updates()
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -213,7 +223,7 @@ class ParameterEditorDialog(QDialog):
         
         # Waveform type
         self.waveform_combo = QComboBox()
-        self.waveform_combo.addItems(["Sine", "Triangle", "Square", "Step", "Noise"])
+        self.waveform_combo.addItems(["Sine", "Triangle", "Square", "Step", "Noise", "Sampled"])
         self.waveform_combo.setCurrentText(self.param.waveform if self.param else "Sine")
         form.addRow("Waveform:", self.waveform_combo)
         
@@ -246,6 +256,87 @@ class ParameterEditorDialog(QDialog):
         self.max_spin.setValue(self.param.max_v if self.param else 1.0)
         form.addRow("Max Value:", self.max_spin)
         
+        # Noise settings (only shown for the Noise waveform)
+        self.noise_type_combo = QComboBox()
+        self.noise_type_combo.addItems(["uniform", "gaussian", "band_limited"])
+        self.noise_type_combo.setCurrentText(self.param.noise_type if self.param else "uniform")
+        self.noise_type_label = QLabel("Noise Type:")
+        form.addRow(self.noise_type_label, self.noise_type_combo)
+
+        self.noise_sigma_spin = QDoubleSpinBox()
+        self.noise_sigma_spin.setRange(0.01, 1.0)
+        self.noise_sigma_spin.setDecimals(2)
+        self.noise_sigma_spin.setSingleStep(0.05)
+        self.noise_sigma_spin.setValue(self.param.noise_sigma if self.param else 0.33)
+        self.noise_sigma_spin.setToolTip("Standard deviation as a fraction of half the Min..Max range")
+        self.noise_sigma_label = QLabel("Noise Sigma:")
+        form.addRow(self.noise_sigma_label, self.noise_sigma_spin)
+
+        self.noise_cutoff_spin = QDoubleSpinBox()
+        self.noise_cutoff_spin.setRange(0.001, 0.5)
+        self.noise_cutoff_spin.setDecimals(3)
+        self.noise_cutoff_spin.setSingleStep(0.01)
+        self.noise_cutoff_spin.setValue(self.param.noise_cutoff if self.param else 0.1)
+        self.noise_cutoff_spin.setToolTip("Band-limited cutoff as a fraction of the sample rate")
+        self.noise_cutoff_label = QLabel("Noise Cutoff:")
+        form.addRow(self.noise_cutoff_label, self.noise_cutoff_spin)
+
+        self.noise_seed_spin = QSpinBox()
+        self.noise_seed_spin.setRange(-1, 2147483647)
+        self.noise_seed_spin.setSpecialValueText("Engine default")
+        self.noise_seed_spin.setValue(self.param.noise_seed if self.param and self.param.noise_seed is not None else -1)
+        self.noise_seed_label = QLabel("Noise Seed:")
+        form.addRow(self.noise_seed_label, self.noise_seed_spin)
+
+        # Sample file settings (only shown for the Sampled waveform)
+        self.sample_file_edit = QLineEdit(self.param.sample_file or "" if self.param else "")
+        self.sample_file_edit.setToolTip(".npy array or raw little-endian float32 samples; values are used as recorded")
+        self.sample_browse_btn = QPushButton("Browse...")
+        self.sample_browse_btn.clicked.connect(self._browse_sample_file)
+        self.sample_file_row = QWidget()
+        file_layout = QHBoxLayout(self.sample_file_row)
+        file_layout.setContentsMargins(0, 0, 0, 0)
+        file_layout.addWidget(self.sample_file_edit)
+        file_layout.addWidget(self.sample_browse_btn)
+        self.sample_file_label = QLabel("Sample File:")
+        form.addRow(self.sample_file_label, self.sample_file_row)
+
+        self.sample_rate_spin = QDoubleSpinBox()
+        self.sample_rate_spin.setRange(0.001, 1000000.0)
+        self.sample_rate_spin.setDecimals(3)
+        self.sample_rate_spin.setValue(self.param.sample_rate if self.param else 1.0)
+        self.sample_rate_label = QLabel("Sample Rate (Hz):")
+        form.addRow(self.sample_rate_label, self.sample_rate_spin)
+
+        self.sample_start_spin = QDoubleSpinBox()
+        self.sample_start_spin.setRange(-10000.0, 10000.0)
+        self.sample_start_spin.setDecimals(3)
+        self.sample_start_spin.setValue(self.param.sample_start if self.param else 0.0)
+        self.sample_start_spin.setToolTip("Record time of the first sample in the file")
+        self.sample_start_label = QLabel("Sample Start (s):")
+        form.addRow(self.sample_start_label, self.sample_start_spin)
+
+        self.sample_interp_combo = QComboBox()
+        self.sample_interp_combo.addItems(["linear", "nearest"])
+        self.sample_interp_combo.setCurrentText(self.param.sample_interpolation if self.param else "linear")
+        self.sample_interp_label = QLabel("Interpolation:")
+        form.addRow(self.sample_interp_label, self.sample_interp_combo)
+
+        self.sample_loop_check = QCheckBox("Loop (otherwise hold the first/last sample)")
+        self.sample_loop_check.setChecked(self.param.sample_loop if self.param else True)
+        self.sample_loop_label = QLabel("Looping:")
+        form.addRow(self.sample_loop_label, self.sample_loop_check)
+
+        self.sample_column_spin = QSpinBox()
+        self.sample_column_spin.setRange(0, 65535)
+        self.sample_column_spin.setValue(self.param.sample_column if self.param else 0)
+        self.sample_column_spin.setToolTip("Column of a 2-D .npy file")
+        self.sample_column_label = QLabel("Column:")
+        form.addRow(self.sample_column_label, self.sample_column_spin)
+
+        self.waveform_combo.currentTextChanged.connect(self._on_waveform_changed)
+        self._on_waveform_changed(self.waveform_combo.currentText())
+
         # Full sweep control removed (always full sweep behavior)
         
         # For bit-major, value toggles strictly between Min and Max; no fixed value control
@@ -281,69 +372,58 @@ class ParameterEditorDialog(QDialog):
         self.bit_width_label.setVisible(is_major)
         self.bit_width_spin.setVisible(is_major)
     
+    def _on_waveform_changed(self, waveform):
+        """Show the noise controls only for the Noise waveform and the sample file
+        controls only for the Sampled waveform"""
+        is_noise = waveform == "Noise"
+        for widget in (self.noise_type_label, self.noise_type_combo, self.noise_sigma_label, self.noise_sigma_spin,
+                       self.noise_cutoff_label, self.noise_cutoff_spin, self.noise_seed_label, self.noise_seed_spin):
+            widget.setVisible(is_noise)
+        is_sampled = waveform == "Sampled"
+        for widget in (self.sample_file_label, self.sample_file_row, self.sample_rate_label, self.sample_rate_spin,
+                       self.sample_start_label, self.sample_start_spin, self.sample_interp_label,
+                       self.sample_interp_combo, self.sample_loop_label, self.sample_loop_check,
+                       self.sample_column_label, self.sample_column_spin):
+            widget.setVisible(is_sampled)
+
+    def _browse_sample_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Sample File", "",
+                                              "Sample Files (*.npy *.f32 *.raw *.bin);;All Files (*)")
+        if path:
+            self.sample_file_edit.setText(path)
+
+    def _connect_preview_updates(self):
+        for widget in self.findChildren(QLineEdit):
+            widget.textChanged.connect(self._schedule_preview)
+        for widget in self.findChildren(QSpinBox) + self.findChildren(QDoubleSpinBox):
+            widget.valueChanged.connect(self._schedule_preview)
+        for widget in self.findChildren(QComboBox):
+            widget.currentTextChanged.connect(self._schedule_preview)
+        for widget in self.findChildren(QCheckBox):
+            widget.toggled.connect(self._schedule_preview)
+
+    def _schedule_preview(self, *_args):
+        if self.preview is not None and self.preview.isVisible():
+            self.preview_timer.start()
+
+    def _refresh_preview(self):
+        self.preview.set_parameter(self.get_parameter())
+
     def preview_parameter(self):
-        """Preview the parameter for 10 seconds"""
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton
-        from PyQt5.QtCore import QTimer
-        import pyqtgraph as pg
-        from core.waveform import make_waveform
-        import time
-        
-        # Create preview dialog
-        preview_dialog = QDialog(self)
-        preview_dialog.setWindowTitle("Parameter Preview")
-        preview_dialog.setGeometry(200, 200, 600, 400)
-        
-        layout = QVBoxLayout(preview_dialog)
-        
-        # Create plot widget
-        plot_widget = pg.PlotWidget()
-        plot_widget.setBackground('k')
-        plot_widget.showGrid(x=True, y=True)
-        plot_widget.setLabel('left', 'Value')
-        plot_widget.setLabel('bottom', 'Time (s)')
-        layout.addWidget(plot_widget)
-        
-        # Add close button
-        close_btn = QPushButton("Close Preview")
-        close_btn.clicked.connect(preview_dialog.accept)
-        layout.addWidget(close_btn)
-        
-        # Get current parameter settings
-        cycle_type = self.cycle_combo.currentIndex()
-        samples_per_500ms = 1 if cycle_type == 0 else 5
-        dtype = "bit" if cycle_type == 0 else "float"
-        
-        # Create waveform
-        waveform_type = self.waveform_combo.currentText()
-        freq = self.freq_spin.value()
-        phase = self.phase_spin.value() * math.pi / 180.0
-        
-        # Always use full sweep behavior
-        wf = make_waveform(waveform_type, freq, phase, True)
-        min_v = self.min_spin.value()
-        max_v = self.max_spin.value()
-        
-        # Generate preview data
-        time_data = []
-        value_data = []
-        
-        start_time = 0.0
-        duration = 10.0  # 10 seconds
-        sample_rate = 10.0  # 10 samples per second
-        
-        for i in range(int(duration * sample_rate)):
-            t = start_time + i / sample_rate
-            value = wf.value(t, min_v, max_v)
-            time_data.append(t)
-            value_data.append(value)
-        
-        # Plot the data
-        plot_widget.plot(time_data, value_data, pen=pg.mkPen(color='cyan', width=2), 
-                        symbol='o', symbolSize=4, symbolBrush='cyan')
-        
-        # Show the dialog
-        preview_dialog.exec_()
+        """Show or hide the 10 second preview below the settings tabs"""
+        if self.preview is None:
+            from gui.widgets.waveform_preview import WaveformPreviewWidget
+            self.preview = WaveformPreviewWidget(noise_seed=self.noise_seed)
+            self.preview.setMinimumHeight(220)
+            self.layout().insertWidget(1, self.preview)
+        elif self.preview.isVisible():
+            self.preview.hide()
+            self.preview_btn.setText("Preview (10s)")
+            self.adjustSize()
+            return
+        self.preview.show()
+        self.preview_btn.setText("Hide Preview")
+        self._refresh_preview()
     
     def get_parameter(self):
         cycle_type = self.cycle_combo.currentIndex()
@@ -367,5 +447,15 @@ class ParameterEditorDialog(QDialog):
             start_time=self.start_time_spin.value(),
             end_time=self.end_time_spin.value(),
             fixed_value=None,
-            bit_width=self.bit_width_spin.value()
+            bit_width=self.bit_width_spin.value(),
+            noise_type=self.noise_type_combo.currentText(),
+            noise_sigma=self.noise_sigma_spin.value(),
+            noise_cutoff=self.noise_cutoff_spin.value(),
+            noise_seed=self.noise_seed_spin.value() if self.noise_seed_spin.value() >= 0 else None,
+            sample_file=self.sample_file_edit.text().strip() or None,
+            sample_rate=self.sample_rate_spin.value(),
+            sample_start=self.sample_start_spin.value(),
+            sample_interpolation=self.sample_interp_combo.currentText(),
+            sample_loop=self.sample_loop_check.isChecked(),
+            sample_column=self.sample_column_spin.value()
         )
\ No newline at end of file
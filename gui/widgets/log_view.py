@@ -1,27 +1,100 @@
-from PyQt5.QtWidgets import QTextEdit, QVBoxLayout, QWidget, QCheckBox, QHBoxLayout
+from PyQt5.QtWidgets import QPlainTextEdit, QVBoxLayout, QWidget, QCheckBox, QHBoxLayout
+from PyQt5.QtGui import QTextCursor
+import html
+import logging
+from utils.log import ROOT, RingLogHandler, add_handler, get_logger, set_level
+
+LEVEL_COLORS = {logging.DEBUG: "#9e9e9e", logging.INFO: "#ffffff", logging.WARNING: "orange", logging.ERROR: "red"}
 
 class LogViewWidget(QWidget):
-    def __init__(self):
+    """Log panel fed by a RingLogHandler.
+
+    Records are buffered by the handler and appended in one batch per flush()
+    (called once per frame), the view keeps at most `capacity` lines, and the
+    level checkboxes filter both new lines and the retained history. Debug also
+    lowers the logger level, since debug records are otherwise never emitted.
+    """
+
+    def __init__(self, capacity=2000):
         super().__init__()
         layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setReadOnly(True)
+        self.text_edit.setMaximumBlockCount(capacity)
         layout.addWidget(self.text_edit)
         filter_lay = QHBoxLayout()
+        self.debug_check = QCheckBox("Debug")
         self.info_check = QCheckBox("Info")
         self.info_check.setChecked(True)
         self.warning_check = QCheckBox("Warning")
         self.warning_check.setChecked(True)
         self.error_check = QCheckBox("Error")
         self.error_check.setChecked(True)
+        filter_lay.addWidget(self.debug_check)
         filter_lay.addWidget(self.info_check)
         filter_lay.addWidget(self.warning_check)
         filter_lay.addWidget(self.error_check)
+        filter_lay.addStretch()
         layout.addLayout(filter_lay)
-        # Filters not fully implemented; assume all shown
+        self.handler = add_handler(RingLogHandler(capacity))
+        # Level to restore when Debug is unchecked (INFO if debug was already on at startup)
+        root = logging.getLogger(ROOT)
+        debug_on = root.isEnabledFor(logging.DEBUG)
+        self._root_level = logging.INFO if debug_on else root.level
+        self.debug_check.setChecked(debug_on)
+        self.debug_check.toggled.connect(self._set_debug)
+        for check in (self.debug_check, self.info_check, self.warning_check, self.error_check):
+            check.toggled.connect(self._refilter)
+        self.logger = get_logger("gui")
+
+    def _shown(self, levelno):
+        if levelno >= logging.ERROR:
+            return self.error_check.isChecked()
+        if levelno >= logging.WARNING:
+            return self.warning_check.isChecked()
+        if levelno >= logging.INFO:
+            return self.info_check.isChecked()
+        return self.debug_check.isChecked()
+
+    def _set_debug(self, checked):
+        set_level("", logging.DEBUG if checked else self._root_level)
+
+    def _append(self, entries):
+        lines = [f'<span style="color:{LEVEL_COLORS.get(levelno, "#ffffff")}">{html.escape(text)}</span>'
+                 for levelno, text in entries if self._shown(levelno)]
+        if not lines:
+            return
+        scroll = self.text_edit.verticalScrollBar()
+        at_bottom = scroll.value() == scroll.maximum()
+        # One edit block for the batch: a single layout and scroll update. Each line is its
+        # own block so setMaximumBlockCount still bounds the view
+        document = self.text_edit.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for i, line in enumerate(lines):
+            if i or not document.isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(line)
+        cursor.endEditBlock()
+        if at_bottom:
+            scroll.setValue(scroll.maximum())
+
+    def flush(self):
+        """Append every record logged since the last flush."""
+        self._append(self.handler.drain())
+
+    def _refilter(self, _checked=None):
+        # Re-render the retained history under the new filters
+        self.handler.drain()
+        self.text_edit.clear()
+        self._append(list(self.handler.records))
 
     def add_log(self, msg, level="INFO"):
-        color = {"INFO": "black", "WARNING": "orange", "ERROR": "red"}.get(level, "black")
-        self.text_edit.append(f'<font color="{color}">{level}: {msg}</font>')
-        self.text_edit.ensureCursorVisible()
\ No newline at end of file
+        self.logger.log(logging.getLevelName(level), "%s", msg)
+
+    def detach(self):
+        """Stop receiving records (the handler is attached to every category)."""
+        logging.getLogger(ROOT).removeHandler(self.handler)
@@ -1,106 +1,237 @@
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QCheckBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QTableView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+import numpy as np
+from core.models import Parameter
+from utils.log import get_logger
 
-class ParameterTableWidget(QTableWidget):
+log = get_logger("gui.table")
+
+MAX_SAMPLES = 5  # Samples per record of a minor-cycle parameter
+
+class ParameterTableModel(QAbstractTableModel):
+    """Table model over a parameter list.
+
+    Parameter columns are read from the Parameter objects on demand; the two
+    check columns use the check-state role. Instantaneous values and times are
+    held in NumPy arrays, one row per parameter, and are only formatted for the
+    rows the view asks for, so a whole record updates with one dataChanged.
+    """
     HEADERS = ["S.No", "Show in Graph", "Enabled", "Name", "Packet ID", "Type", "Offset", "Length", "Inst. Value", "Time"]
+    GRAPH_COL, ENABLED_COL, NAME_COL, VALUE_COL, TIME_COL = 1, 2, 3, 8, 9
 
-    def __init__(self, parameters_list=None):
-        super().__init__(0, len(self.HEADERS))
-        self.setHorizontalHeaderLabels(self.HEADERS)
-        self.parameters_list = parameters_list
+    def __init__(self, params=None, parent=None):
+        super().__init__(parent)
+        self.params = params if params is not None else []
+        self._reset_storage()
+
+    def _reset_storage(self):
+        n = len(self.params)
+        self.values = np.zeros((n, MAX_SAMPLES))
+        self.times = np.zeros((n, MAX_SAMPLES))
+        self.counts = np.zeros(n, dtype=np.int8)  # Samples shown per row; 0 until the first value
+        self._reindex()
+
+    def _reindex(self):
         # Hash map for O(1) parameter name lookup: name -> row_index
-        self.name_to_row = {}
+        self.name_to_row = {p.name: r for r, p in enumerate(self.params)}
+        self._rows_for = (None, None)  # Cached (block names, rows) for update_samples
 
-    def load_parameters(self, params):
-        self.setRowCount(0)
-        self.name_to_row.clear()  # Clear the hash map
-        for param in params:
-            self.add_parameter(param)
+    # Qt model interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.params)
 
-    def add_parameter(self, param):
-        r = self.rowCount()
-        self.insertRow(r)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        col = index.column()
+        if col == self.ENABLED_COL:
+            flags |= Qt.ItemIsUserCheckable
+        elif col == self.GRAPH_COL:
+            flags |= Qt.ItemIsUserCheckable
+            # Graph checkbox availability depends on Enabled state
+            if not self.params[index.row()].enabled:
+                flags &= ~Qt.ItemIsEnabled
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, col = index.row(), index.column()
+        param = self.params[r]
+        if role == Qt.CheckStateRole:
+            if col == self.GRAPH_COL:
+                return Qt.Checked if param.enabled_in_graph else Qt.Unchecked
+            if col == self.ENABLED_COL:
+                return Qt.Checked if param.enabled else Qt.Unchecked
+            return None
+        if role != Qt.DisplayRole:
+            return None
+        if col == 0:
+            return str(getattr(param, 'sl_no', r + 1))
+        if col == self.NAME_COL:
+            return param.name
+        if col == 4:
+            return str(param.packet_id)
+        if col == 5:
+            return param.dtype
+        if col == 6:
+            return str(param.offset)
+        if col == 7:
+            return str(self._length(param))
+        if col in (self.VALUE_COL, self.TIME_COL):
+            n = self.counts[r]
+            if n == 0:
+                return ""
+            if col == self.VALUE_COL:
+                return " | ".join(f"{v:.4g}" for v in self.values[r, :n].tolist())
+            return " | ".join(f"{t:.3f}" for t in self.times[r, :n].tolist())
+        return ""
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        r, col = index.row(), index.column()
+        state = value == Qt.Checked
+        param = self.params[r]
+        if col == self.GRAPH_COL:
+            param.enabled_in_graph = state
+            log.debug("Parameter %s graph enabled: %s (row %d)", param.name, state, r)
+        elif col == self.ENABLED_COL:
+            param.enabled = state
+            if not state:
+                # Also uncheck graph when disabled to reflect non-participation
+                param.enabled_in_graph = False
+            log.info("Parameter %s enabled: %s", param.name, state)
+        else:
+            return False
+        self.dataChanged.emit(self.index(r, self.GRAPH_COL), self.index(r, self.ENABLED_COL))
+        return True
+
+    @staticmethod
+    def _length(param):
         if param.dtype == "float":
-            length = 4 * param.samples_per_500ms  # 4 bytes per sample
-        else:  # Digital
-            length = (param.bit_width // 8 if param.samples_per_500ms == 1 else 8) * param.samples_per_500ms
-        values = [
-            QTableWidgetItem(str(getattr(param, 'sl_no', r + 1))),
-            QTableWidgetItem(""),  # Placeholder for graph checkbox
-            QTableWidgetItem(""),  # Placeholder for enabled checkbox
-            QTableWidgetItem(param.name),
-            QTableWidgetItem(str(param.packet_id)),
-            QTableWidgetItem(param.dtype),
-            QTableWidgetItem(str(param.offset)),
-            QTableWidgetItem(str(length)),
-            QTableWidgetItem(""),
-            QTableWidgetItem("")
-        ]
-        for c, item in enumerate(values):
-            self.setItem(r, c, item)
-        # Make S.No non-editable
-        sn_item = self.item(r, 0)
-        if sn_item:
-            sn_item.setFlags(sn_item.flags() & ~Qt.ItemIsEditable)
-        graph_checkbox = QCheckBox()
-        graph_checkbox.setChecked(param.enabled_in_graph)
-        graph_checkbox.stateChanged.connect(lambda state, row=r: self._update_graph_enable(row, state))
-        # Graph checkbox availability depends on Enabled state
-        graph_checkbox.setEnabled(bool(param.enabled))
-        self.setCellWidget(r, 1, graph_checkbox)
-
-        enabled_checkbox = QCheckBox()
-        enabled_checkbox.setChecked(param.enabled)
-        enabled_checkbox.stateChanged.connect(lambda state, row=r: self._update_enabled(row, state))
-        self.setCellWidget(r, 2, enabled_checkbox)
-        
-        # Add to hash map for O(1) lookup
+            return 4 * param.samples_per_500ms  # 4 bytes per sample
+        # Digital
+        return (param.bit_width // 8 if param.samples_per_500ms == 1 else 8) * param.samples_per_500ms
+
+    # Structure changes
+    def load_parameters(self, params):
+        self.beginResetModel()
+        self.params = params
+        self._reset_storage()
+        self.endResetModel()
+
+    def append_parameter(self, param):
+        r = len(self.params)
+        self.beginInsertRows(QModelIndex(), r, r)
+        self.params.append(param)
+        Parameter.edits += 1  # Row changes are edits too: running engines re-check their plans
+        self.values = np.vstack((self.values, np.zeros((1, MAX_SAMPLES))))
+        self.times = np.vstack((self.times, np.zeros((1, MAX_SAMPLES))))
+        self.counts = np.append(self.counts, np.int8(0))
         self.name_to_row[param.name] = r
+        self._rows_for = (None, None)
+        self.endInsertRows()
+
+    def replace_parameter(self, r, param):
+        self.params[r] = param
+        Parameter.edits += 1
+        self.counts[r] = 0
+        self._reindex()
+        self.dataChanged.emit(self.index(r, 0), self.index(r, len(self.HEADERS) - 1))
+
+    def remove_parameter(self, r):
+        self.beginRemoveRows(QModelIndex(), r, r)
+        param = self.params.pop(r)
+        Parameter.edits += 1
+        self.values = np.delete(self.values, r, axis=0)
+        self.times = np.delete(self.times, r, axis=0)
+        self.counts = np.delete(self.counts, r)
+        self._reindex()
+        self.endRemoveRows()
+        return param
+
+    # Live values
+    def _rows(self, names):
+        cached_names, rows = self._rows_for
+        if cached_names is not names:
+            rows = np.array([self.name_to_row.get(name, -1) for name in names], dtype=np.intp)
+            self._rows_for = (names, rows)
+        return rows
+
+    def update_samples(self, samples):
+        """Show one record's SampleBlock: every row it covers changes in a single dataChanged."""
+        if not len(samples) or not len(self.params):
+            return
+        rows = self._rows(samples.names)
+        counts = np.diff(samples.starts)
+        known = rows >= 0
+        sample_row = np.repeat(rows, counts)
+        sample_col = np.arange(len(samples.values)) - np.repeat(samples.starts[:-1], counts)
+        keep = (sample_row >= 0) & (sample_col < MAX_SAMPLES)
+        self.values[sample_row[keep], sample_col[keep]] = samples.values[keep]
+        self.times[sample_row[keep], sample_col[keep]] = samples.times[keep]
+        self.counts[rows[known]] = np.minimum(counts[known], MAX_SAMPLES)
+        if known.any():
+            self.dataChanged.emit(self.index(int(rows[known].min()), self.VALUE_COL),
+                                  self.index(int(rows[known].max()), self.TIME_COL), [Qt.DisplayRole])
+
+    def clear_values(self, value=0.0, t=0.0):
+        """Show the same value and time in every row (one value per row)."""
+        self.values[:, 0] = value
+        self.times[:, 0] = t
+        self.counts[:] = 1
+        if len(self.params):
+            self.dataChanged.emit(self.index(0, self.VALUE_COL), self.index(len(self.params) - 1, self.TIME_COL),
+                                  [Qt.DisplayRole])
+
+
+class ParameterTableWidget(QTableView):
+    """Parameter table view over a ParameterTableModel."""
+
+    def __init__(self, parameters_list=None):
+        super().__init__()
+        self.table_model = ParameterTableModel(parameters_list, self)
+        self.setModel(self.table_model)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+
+    @property
+    def parameters_list(self):
+        return self.table_model.params
+
+    @property
+    def name_to_row(self):
+        return self.table_model.name_to_row
+
+    def currentRow(self):
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def load_parameters(self, params):
+        """Show params; the table edits this list in place from now on."""
+        self.table_model.load_parameters(params)
+
+    def add_parameter(self, param):
+        self.table_model.append_parameter(param)
+
+    def replace_parameter(self, row, param):
+        self.table_model.replace_parameter(row, param)
+
+    def remove_parameter(self, row):
+        return self.table_model.remove_parameter(row)
+
+    def update_samples(self, samples):
+        self.table_model.update_samples(samples)
 
-    def _update_graph_enable(self, row, state):
-        # Update parameter enabled_in_graph state
-        if self.parameters_list and row < len(self.parameters_list):
-            self.parameters_list[row].enabled_in_graph = bool(state)
-            param_name = self.item(row, 3).text() if self.item(row, 3) else "Unknown"
-            print(f"DEBUG: Parameter {param_name} graph enabled: {bool(state)} (row {row})")
-            print(f"DEBUG: Parameter object enabled_in_graph: {self.parameters_list[row].enabled_in_graph}")
-
-    def _update_enabled(self, row, state):
-        # Update parameter enabled state
-        if self.parameters_list and row < len(self.parameters_list):
-            self.parameters_list[row].enabled = bool(state)
-            # Enable/disable the graph checkbox accordingly
-            graph_checkbox = self.cellWidget(row, 1)
-            if isinstance(graph_checkbox, QCheckBox):
-                graph_checkbox.setEnabled(bool(state))
-                if not bool(state):
-                    # Also uncheck when disabled to reflect non-participation
-                    graph_checkbox.setChecked(False)
-            param_name = self.item(row, 3).text() if self.item(row, 3) else "Unknown"
-            print(f"Parameter {param_name} enabled: {bool(state)}")
-
-    def update_instantaneous(self, name, value, t, time_increment=1.0):
-        """Update instantaneous value and time for a parameter (major cycle or minor cycle).
-
-        If minor-cycle values are provided along with an explicit list of sample times,
-        the provided times will be displayed verbatim. Otherwise, times will be
-        reconstructed using the given time_increment.
-        """
-        # O(1) hash lookup instead of O(n) linear search
-        if name not in self.name_to_row:
-            return  # Parameter not found
-        
-        r = self.name_to_row[name]
-        if isinstance(value, list):  # Minor cycle
-            values_text = " | ".join([f"{v:.4g}" for v in value])
-            # If t is a list of times matching value count, use it directly
-            if isinstance(t, list) and len(t) == len(value):
-                times_text = " | ".join([f"{ti:.3f}" for ti in t])
-            else:
-                sample_spacing = time_increment / 5.0
-                times_text = " | ".join([f"{t + i*sample_spacing:.3f}" for i in range(5)])
-            self.setItem(r, 8, QTableWidgetItem(values_text))
-            self.setItem(r, 9, QTableWidgetItem(times_text))
-        else:  # Major cycle
-            self.setItem(r, 8, QTableWidgetItem(f"{value:.4g}"))
-            self.setItem(r, 9, QTableWidgetItem(f"{t:.3f}"))
\ No newline at end of file
+    def clear_values(self, value=0.0, t=0.0):
+        self.table_model.clear_values(value, t)
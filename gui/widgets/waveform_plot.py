@@ -1,8 +1,13 @@
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QFileDialog, QDialog, QVBoxLayout, QPushButton
 from PyQt5.QtCore import QTimer
-from collections import deque
-from core.waveform import make_waveform
+import numpy as np
+from utils.minmax_pyramid import MinMaxPyramid
+from utils.log import get_logger
+
+log = get_logger("gui.plot")
+
+SYMBOL_POINT_LIMIT = 200  # Draw per-sample symbols only for raw samples up to this many points
 
 class WaveformPlotWidget(pg.PlotWidget):
     def __init__(self):
@@ -11,93 +16,96 @@ class WaveformPlotWidget(pg.PlotWidget):
         self.showGrid(x=True, y=True)
         self.setLabel('left', 'Value')
         self.setLabel('bottom', 'Time (s)')
-        self.curves = {}  # name -> (plotItem, data_deque)
+        self.curves = {}  # name -> (plotItem, MinMaxPyramid)
+        self.symbols = {}  # name -> symbol, while the curve is drawn with symbols
+        self.curve_symbols = {}  # name -> the curve's symbol
         self.marker = None
-        self.window_seconds = 10.0  # Rolling time window for display
+        self.window_seconds = 10.0  # Width of the live window while following
+        self.follow_live = True  # Pan with incoming data; off once the user pans or zooms by mouse
+        # Ingested but not yet drawn: changed curves, newest record time and marker point
+        self._dirty = set()
+        self._latest_time = None
+        self._last_time = None
+        self._marker_point = None
+        self._view_changed = False
+        self.getViewBox().sigXRangeChanged.connect(self._on_x_range_changed)
+        self.getViewBox().sigRangeChangedManually.connect(self._on_range_changed_manually)
 
-    def update_waveform(self, params, current_time, time_increment=1.0):
-        print(f"DEBUG: WaveformPlotWidget.update_waveform called with {len(params)} parameters")
-        print(f"DEBUG: Parameter names: {[p.name for p in params]}")
-        print(f"DEBUG: Parameter enabled_in_graph states: {[p.enabled_in_graph for p in params]}")
-        processed_count = 0
-        marker_set = False  # Track if marker has been set
-        for p in params:
-            print(f"DEBUG: Processing param {p.name}, enabled_in_graph={p.enabled_in_graph}")
-            if p.enabled_in_graph:
-                processed_count += 1
-                if p.samples_per_500ms == 1:  # Major cycle - single value
-                    if p.dtype == "float":
-                        # Float major: continuous waveform
-                        wf = make_waveform(p.waveform, p.freq, p.phase, p.full_sweep)
-                        y = wf.value(current_time, p.min_v, p.max_v)
-                        self.update_sample(p.name, current_time, y)
-                        if not marker_set:
-                            self.set_marker(current_time, y)
-                            marker_set = True
-                    else:
-                        # Bit major: discrete min/max points only
-                        wf = make_waveform(p.waveform, p.freq, p.phase, p.full_sweep)
-                        analog = wf.value(current_time, p.min_v, p.max_v)
-                        threshold = (p.min_v + p.max_v) / 2.0
-                        y = p.min_v if analog < threshold else p.max_v
-                        self.update_sample(p.name, current_time, y)
-                        if not marker_set:
-                            self.set_marker(current_time, y)
-                            marker_set = True
-                else:  # Minor cycle - 5 samples without any phase-offset (display-only)
-                    wf = make_waveform(p.waveform, p.freq, p.phase, p.full_sweep)
-                    sample_spacing = time_increment / 5.0
-                    for i in range(5):
-                        sample_time = current_time + i * sample_spacing
-                        if p.dtype == "float":
-                            y = wf.value(sample_time, p.min_v, p.max_v)
-                        else:
-                            # Bit minor: discrete min/max at each sub-sample
-                            analog = wf.value(sample_time, p.min_v, p.max_v)
-                            threshold = (p.min_v + p.max_v) / 2.0
-                            y = p.min_v if analog < threshold else p.max_v
-                        self.update_sample(p.name, sample_time, y)
-                    
-                    # Set marker at the first sample time (only once)
-                    if not marker_set:
-                        if p.dtype == "float":
-                            first_y = wf.value(current_time, p.min_v, p.max_v)
-                        else:
-                            analog = wf.value(current_time, p.min_v, p.max_v)
-                            threshold = (p.min_v + p.max_v) / 2.0
-                            first_y = p.min_v if analog < threshold else p.max_v
-                        self.set_marker(current_time, first_y)
-                        marker_set = True
-        print(f"DEBUG: Processed {processed_count} enabled parameters, total curves: {len(self.curves)}")
-        # Keep only the last window worth of data and pan the view
-        self._prune_window(current_time)
-        start_x = current_time - self.window_seconds
-        self.setXRange(start_x, current_time, padding=0)
+    def append_samples(self, samples):
+        """Append one record's SampleBlock to the curves of its graphed parameters without
+        drawing; render_frame() draws everything appended since the last frame."""
+        graphed = np.flatnonzero(samples.graphed)
+        for i in graphed:
+            name = samples.names[i]
+            t, y = samples.samples(i)
+            if name not in self.curves:
+                self.add_param(name)
+            self.curves[name][1].extend(t, y)
+            self._dirty.add(name)
+        if len(graphed):
+            # Marker on the first graphed parameter's first sample
+            t, y = samples.samples(graphed[0])
+            self._marker_point = (t[0], y[0])
+        self._latest_time = samples.record_time
 
-    def update_sample(self, name, t, y):
-        if name not in self.curves:
-            self.add_param(name)
-        plot, data = self.curves[name]
-        data["t"].append(t)
-        data["y"].append(y)
-        plot.setData(list(data["t"]), list(data["y"]))
+    def render_frame(self):
+        """Draw what arrived since the last frame. Each curve is drawn at the decimation
+        level matching the visible range and the plot's pixel width, so the cost per frame
+        does not depend on how much history is visible."""
+        if self._latest_time is None and not self._view_changed:
+            return
+        if self._latest_time is not None:
+            self._last_time = self._latest_time
+            self._latest_time = None
+        if self._marker_point is not None:
+            self.set_marker(*self._marker_point)
+            self._marker_point = None
+        if self.follow_live and self._last_time is not None:
+            x0, x1 = self._last_time - self.window_seconds, self._last_time
+        else:
+            x0, x1 = self.getViewBox().viewRange()[0]
+        # A moved view needs every curve at its new level of detail
+        names = list(self.curves) if (self.follow_live or self._view_changed) else list(self._dirty)
+        self._redraw(names, x0, x1)
+        self._dirty.clear()
+        if self.follow_live and self._last_time is not None:
+            self.setXRange(x0, x1, padding=0)
+        self._view_changed = False
+
+    def _redraw(self, names, x0, x1):
+        """One setData per curve with at most about two points per pixel."""
+        budget = max(2, int(self.getViewBox().width()) or 1000)
+        for name in names:
+            plot, data = self.curves[name]
+            t, y, level = data.points(x0, x1, budget)
+            # Symbols only while individual samples are distinguishable
+            symbol = self.curve_symbols[name] if level == 0 and len(t) <= SYMBOL_POINT_LIMIT else None
+            if self.symbols.get(name) != symbol:
+                plot.setSymbol(symbol)
+                self.symbols[name] = symbol
+            plot.setData(t, y)
+
+    def _on_x_range_changed(self, *_):
+        self._view_changed = True
+
+    def _on_range_changed_manually(self, *_):
+        # Mouse pan/zoom: stop following so the user can inspect history
+        self.follow_live = False
 
-    def _prune_window(self, current_time):
-        """Remove points older than the rolling window for all curves."""
-        cutoff = current_time - self.window_seconds
-        for name, (plot, data) in self.curves.items():
-            # Pop from left while outside window
-            while data["t"] and data["t"][0] < cutoff:
-                data["t"].popleft()
-                data["y"].popleft()
-            # Update plot after pruning
-            plot.setData(list(data["t"]), list(data["y"]))
+    def set_follow_live(self, follow=True):
+        """Follow incoming data, keeping the current view width."""
+        if follow and not self.follow_live:
+            x0, x1 = self.getViewBox().viewRange()[0]
+            if x1 > x0:
+                self.window_seconds = x1 - x0
+        self.follow_live = follow
+        self._view_changed = True
 
     def add_param(self, name):
         """Add a new parameter curve to the plot"""
-        print(f"DEBUG: add_param called for {name}")
+        log.debug("add_param called for %s", name)
         if name not in self.curves:
-            print(f"DEBUG: Creating new curve for {name} (total curves: {len(self.curves)})")
+            log.debug("Creating new curve for %s (total curves: %d)", name, len(self.curves))
             # Define colors and symbols arrays
             colors = [
                 # Basic colors
@@ -135,11 +143,10 @@ class WaveformPlotWidget(pg.PlotWidget):
             plot_item = self.plot(pen=pg.mkPen(color=pen_color, width=2), 
                                  symbol=symbol, symbolSize=6, symbolBrush=pen_color, name=name)
             
-            # Create data storage with deque for efficient updates
-            data = {
-                "t": deque(maxlen=1000),  # Keep last 1000 time points
-                "y": deque(maxlen=1000)   # Keep last 1000 value points
-            }
+            # Min/max decimation pyramid: bounded memory, reaching back hours
+            data = MinMaxPyramid()
+            self.curve_symbols[name] = symbol
+            self.symbols[name] = symbol
             
             # Store the plot item and data
             self.curves[name] = (plot_item, data)
@@ -162,8 +169,15 @@ class WaveformPlotWidget(pg.PlotWidget):
         # Clear all plot items
         self.clear()
         
-        # Clear the curves dictionary
+        # Clear the curves dictionary and anything not yet drawn
         self.curves.clear()
+        self.symbols.clear()
+        self.curve_symbols.clear()
+        self._dirty.clear()
+        self._latest_time = None
+        self._last_time = None
+        self._marker_point = None
+        self.follow_live = True
         
         # Reset marker
         self.marker = None
@@ -181,6 +195,9 @@ class WaveformPlotWidget(pg.PlotWidget):
             plot_item, _ = self.curves[name]
             self.removeItem(plot_item)
             del self.curves[name]
+            self.symbols.pop(name, None)
+            self.curve_symbols.pop(name, None)
+            self._dirty.discard(name)
             
     def _show_graph_popup(self):
         popup = QDialog(self)
@@ -189,25 +206,30 @@ class WaveformPlotWidget(pg.PlotWidget):
         
         zoom_in = QPushButton("Zoom In")
         zoom_out = QPushButton("Zoom Out")
+        follow_live = QPushButton("Follow Live")
         export_png = QPushButton("Export PNG")
         
         layout.addWidget(zoom_in)
         layout.addWidget(zoom_out)
+        layout.addWidget(follow_live)
         layout.addWidget(export_png)
         
         # Connect button signals
         zoom_in.clicked.connect(self._zoom_in)
         zoom_out.clicked.connect(self._zoom_out)
+        follow_live.clicked.connect(lambda: self.set_follow_live(True))
         export_png.clicked.connect(self._export_png)
         
         popup.exec_()
     
     def _zoom_in(self):
         """Zoom in on the current view"""
+        self.window_seconds *= 0.5
         self.getViewBox().scaleBy((0.5, 0.5))
     
     def _zoom_out(self):
         """Zoom out from the current view"""
+        self.window_seconds *= 2.0
         self.getViewBox().scaleBy((2.0, 2.0))
     
     def _export_png(self):
@@ -220,6 +242,6 @@ class WaveformPlotWidget(pg.PlotWidget):
                 # Export the plot widget as PNG
                 exporter = pg.exporters.ImageExporter(self.plotItem)
                 exporter.export(filename)
-                print(f"Plot exported to {filename}")
+                log.info("Plot exported to %s", filename)
             except Exception as e:
-                print(f"Error exporting plot: {e}")
\ No newline at end of file
+                log.error("Error exporting plot: %s", e)
\ No newline at end of file
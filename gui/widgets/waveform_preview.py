@@ -0,0 +1,108 @@
+import os
+from collections import OrderedDict
+import numpy as np
+import pyqtgraph as pg
+from core.waveform import evaluate_param
+from utils.log import get_logger
+
+log = get_logger("gui.preview")
+
+PREVIEW_SECONDS = 10.0
+MAX_OVERSAMPLE = 16  # Evaluations per pixel column for fast waveforms
+CACHE_SIZE = 64
+# Parameter fields that change the previewed values (name seeds the noise stream)
+PREVIEW_FIELDS = ("name", "waveform", "freq", "phase", "min_v", "max_v", "noise_type", "noise_sigma",
+                  "noise_cutoff", "noise_seed", "sample_file", "sample_rate", "sample_start",
+                  "sample_interpolation", "sample_loop", "sample_column")
+
+_cache = OrderedDict()  # (definition, duration, width) -> (t, y)
+
+def _definition(param):
+    key = tuple(getattr(param, name) for name in PREVIEW_FIELDS)
+    if param.waveform == "Sampled" and param.sample_file:
+        # Rewriting the sample file invalidates its previews
+        try:
+            st = os.stat(param.sample_file)
+            key += (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+    return key
+
+def _oversample(param, duration, width):
+    """Evaluations per pixel column needed to catch the waveform's extremes."""
+    if param.waveform == "Noise":
+        return 1
+    if param.waveform == "Sampled":
+        per_pixel = param.sample_rate * duration / width
+    else:
+        per_pixel = 8 * abs(param.freq) * duration / width  # Eight points per cycle
+    return int(min(max(np.ceil(per_pixel), 1), MAX_OVERSAMPLE))
+
+def preview_points(param, duration=PREVIEW_SECONDS, width=600, noise_seed=0):
+    """(t, y) to draw for the first `duration` seconds of param, `width` pixels wide.
+
+    The waveform is evaluated once for the whole range; when more than one
+    evaluation lands in a pixel column the column is reduced to its minimum and
+    maximum, so fast waveforms draw as an envelope instead of aliasing. Results
+    are cached per parameter definition and width. noise_seed is the engine's
+    noise seed, for Noise parameters without their own.
+    """
+    width = max(int(width), 2)
+    key = (_definition(param), float(duration), width, noise_seed)
+    points = _cache.get(key)
+    if points is not None:
+        _cache.move_to_end(key)
+        return points
+    k = _oversample(param, duration, width)
+    t = np.linspace(0.0, duration, width * k, endpoint=False)
+    y = evaluate_param(param, t, noise_seed)
+    if k > 1:
+        cols = y.reshape(width, k)
+        t = np.repeat(t[::k], 2)
+        y = np.empty(2 * width)
+        y[0::2] = cols.min(axis=1)
+        y[1::2] = cols.max(axis=1)
+    points = (t, y)
+    _cache[key] = points
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return points
+
+
+class WaveformPreviewWidget(pg.PlotWidget):
+    """Preview plot for one parameter definition, redrawn in place at the plot's pixel width."""
+
+    def __init__(self, duration=PREVIEW_SECONDS, noise_seed=0):
+        super().__init__()
+        self.duration = duration
+        self.noise_seed = noise_seed
+        self.param = None
+        self.setBackground('k')
+        self.showGrid(x=True, y=True)
+        self.setLabel('left', 'Value')
+        self.setLabel('bottom', 'Time (s)')
+        self.setMouseEnabled(x=False, y=False)
+        self.setXRange(0.0, duration, padding=0.02)
+        self.curve = self.plot([], [], pen=pg.mkPen(color='cyan', width=2))
+
+    def set_parameter(self, param):
+        self.param = param
+        self.refresh()
+
+    def refresh(self):
+        if getattr(self, "param", None) is None:  # resizeEvent also fires during construction
+            return
+        width = int(self.getViewBox().width()) or self.width()
+        try:
+            t, y = preview_points(self.param, self.duration, width, self.noise_seed)
+        except (OSError, ValueError) as e:
+            log.debug("Preview of %s failed: %s", self.param.name, e)
+            self.curve.setData([], [])
+            self.setTitle(f"Cannot preview waveform: {e}", color='orange')
+            return
+        self.setTitle(None)
+        self.curve.setData(t, y)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
@@ -0,0 +1,156 @@
+# headless.py
+import argparse
+import asyncio
+import os
+import sys
+from core.async_pipeline import AsyncRecordStream, open_destinations
+from core.loader import Loader
+from core.models import Destination
+from core.recorder import DatRecorder
+from core.renderer import OfflineRenderer
+from core.seeder import SeedingEngine
+from utils.config import ConfigManager
+from utils.log import configure
+
+def load_parameter_set(path):
+    """Load parameters from a .csv, .json config or .dat file.
+
+    Returns (params, dat_buffer, simulation_settings); dat_buffer (a DatPlayback of
+    the file's records) is only set for .dat files and settings only for JSON configs.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return Loader().load_csv(path), None, {}
+    if ext == ".json":
+        settings, params = ConfigManager().load_config(path)
+        return params, None, settings
+    if ext == ".dat":
+        result = Loader().load_dat(path)
+        if isinstance(result, tuple):
+            dat_buffer, params = result
+            return params, dat_buffer, {}
+        return [], result, {}
+    raise ValueError(f"Unsupported parameter file: {path}")
+
+async def stream_live(engine, params, dat_buffer, destinations, start_time, end_time, hz, catch_up="burst",
+                      recorder=None):
+    """Send records to every destination in real time on an asyncio loop, also handing each
+    to recorder (a started DatRecorder) if given. Returns the stream."""
+    senders = await open_destinations(destinations)
+    stream = AsyncRecordStream(lambda: params, engine, senders, dat_buffer, start_time, end_time, hz, catch_up)
+    if recorder is not None:
+        stream.add_observer(recorder.enqueue)
+    try:
+        await stream.run()
+    finally:
+        for sender in senders:
+            sender.close()
+    return stream
+
+def main():
+    parser = argparse.ArgumentParser(description="Render Telemetry Simulator records to a capture file without the GUI")
+    parser.add_argument("params", help="Parameter set (.csv, .json config or .dat)")
+    parser.add_argument("--dat", default=None, help="Background .dat file (overrides the one in params)")
+    parser.add_argument("--start", type=float, default=None, help="Start time in seconds (default -900, or from JSON config)")
+    parser.add_argument("--end", type=float, default=None, help="End time in seconds (default 1200, or from JSON config)")
+    parser.add_argument("--hz", type=float, default=None, help="Records per second of simulated time (default 2, or from JSON config)")
+    parser.add_argument("--out", default="capture.dat", help="Output capture file (overwritten)")
+    parser.add_argument("--packet_length", type=int, default=1400,
+                        help="Packet length in bytes (rounded up to a multiple of 4)")
+    parser.add_argument("--packets_per_record", type=int, default=10, help="Packets per record")
+    parser.add_argument("--time_field_offset", type=int, default=24, help="Absolute time offset in packet 0")
+    parser.add_argument("--chunk", type=int, default=2048, help="Records generated per vectorized pass")
+    parser.add_argument("--oscillator_table", type=int, default=None, metavar="SIZE",
+                        help="Run periodic waveforms as phase-accumulating sine-table oscillators with this table size")
+    parser.add_argument("--interpolation", default="linear", choices=["linear", "nearest"],
+                        help="Sine-table interpolation for --oscillator_table")
+    parser.add_argument("--noise_seed", type=int, default=0,
+                        help="Seed for Noise parameters without their own noise_seed (same seed, same bytes)")
+    parser.add_argument("--stream", default=None, metavar="GROUP:PORT[,GROUP:PORT...]",
+                        help="Send records live over UDP at the configured Hz (asyncio runtime) instead of writing --out; "
+                             "each record is generated once and sent to every destination")
+    parser.add_argument("--ttl", type=int, default=1, help="Multicast TTL for --stream")
+    parser.add_argument("--catch_up", default="burst", choices=["burst", "skip", "stretch"],
+                        help="How --stream recovers when it falls behind (burst catches up at most one "
+                             "second of records, then restarts the schedule)")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="With --stream, also record every sent record to a .dat file (parameter header included)")
+    parser.add_argument("--rotate_mb", type=float, default=None, help="Start a new --record file every N MB")
+    parser.add_argument("--rotate_s", type=float, default=None, help="Start a new --record file every N seconds")
+    parser.add_argument("--dat_mode", default="loop", choices=["loop", "hold"],
+                        help="After the last background record of the .dat file, loop or hold the last record")
+    parser.add_argument("--log", default=os.environ.get("SIMISRO_LOG", ""), metavar="SPEC",
+                        help="Log levels, e.g. INFO,core=DEBUG,console=INFO (default: warnings and errors on stderr)")
+    args = parser.parse_args()
+    try:
+        configure(args.log)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        params, dat_buffer, settings = load_parameter_set(args.params)
+        if args.dat:
+            result = Loader().load_dat(args.dat)
+            dat_buffer = result[0] if isinstance(result, tuple) else result
+    except Exception as e:
+        print(f"Error loading parameters: {e}", file=sys.stderr)
+        sys.exit(1)
+    start_time = args.start if args.start is not None else float(settings.get("start_time", -900.0))
+    end_time = args.end if args.end is not None else float(settings.get("end_time", 1200.0))
+    hz = args.hz if args.hz is not None else float(settings.get("hz", 2.0))
+    if hz <= 0:
+        print("Error: --hz must be positive", file=sys.stderr)
+        sys.exit(1)
+    if args.record and not args.stream:
+        print("Error: --record needs --stream (--out already writes the rendered records)", file=sys.stderr)
+        sys.exit(1)
+    if dat_buffer is not None:
+        # The first simulated record plays the file's first record
+        dat_buffer.loop = args.dat_mode == "loop"
+        dat_buffer.rewind(start_time)
+
+    if args.stream:
+        try:
+            destinations = Destination.parse_list(args.stream)
+            for destination in destinations:
+                destination.ttl = args.ttl
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        engine = SeedingEngine(args.packet_length, args.packets_per_record, args.time_field_offset, reuse_records=True,
+                               oscillator_table_size=args.oscillator_table, oscillator_interpolation=args.interpolation,
+                               noise_seed=args.noise_seed)
+        print(f"Streaming {len(params)} parameters, {start_time} .. {end_time} s at {hz} Hz -> {args.stream}")
+        recorder = None
+        if args.record:
+            rotate_bytes = int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None
+            recorder = DatRecorder(args.record, params, rotate_bytes, args.rotate_s).start()
+        try:
+            stream = asyncio.run(stream_live(engine, params, dat_buffer, destinations, start_time, end_time, hz,
+                                             args.catch_up, recorder))
+        except KeyboardInterrupt:
+            print("Interrupted")
+            return
+        finally:
+            if recorder is not None:
+                recorder.stop()
+        print(f"Sent {stream.records_sent} records, {stream.scheduler.late_count} late")
+        for destination, sender in zip(destinations, stream.senders):
+            print(f"  {destination.label()}: {sender.packets_sent} packets, {sender.bytes_sent} bytes, "
+                  f"{sender.errors} errors")
+        if recorder is not None:
+            print(f"Recorded {recorder.records_written} records to {', '.join(recorder.files) or args.record}"
+                  f" ({recorder.dropped} dropped)")
+        return
+
+    engine = SeedingEngine(args.packet_length, args.packets_per_record, args.time_field_offset,
+                           oscillator_table_size=args.oscillator_table, oscillator_interpolation=args.interpolation,
+                           noise_seed=args.noise_seed)
+    renderer = OfflineRenderer(engine, chunk_records=args.chunk)
+    print(f"Rendering {len(params)} parameters, {start_time} .. {end_time} s at {hz} Hz -> {args.out}")
+    records, written, elapsed = renderer.render(params, args.out, start_time, end_time, hz, dat_buffer)
+    rate = records / elapsed if elapsed > 0 else float("inf")
+    print(f"Wrote {records} records ({written} bytes) in {elapsed:.2f} s ({rate:.0f} records/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 # main.py
+import os
 import sys
 from PyQt5 import QtWidgets
 from gui.main_window import MainWindow
+from utils.log import configure
 
 def main():
+    # Log levels, e.g. SIMISRO_LOG="INFO,gui.plot=DEBUG,console=WARNING"
+    configure(os.environ.get("SIMISRO_LOG", ""))
     app = QtWidgets.QApplication(sys.argv)
     
     # Set application-wide grey theme
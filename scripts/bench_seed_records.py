@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Run from the scripts directory: make the project's core package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.models import Parameter
+from core.seeder import SeedingEngine
+
+WAVEFORMS = ["Sine", "Triangle", "Square", "Step", "Noise"]
+
+
+def make_params(count, waveform, packet_length, packets_per_record):
+    """count parameters over every packet: a mix of waveforms (or only `waveform`), float and
+    digital, major and minor cycle, some with a seeding window. Slots wrap around the packets,
+    so large sets overlap the way large real configurations do."""
+    params = []
+    offset = 28  # After the time field
+    for i in range(count):
+        minor = i % 5 == 0
+        digital = i % 3 == 0
+        size = (8 if minor else 4) if digital else (20 if minor else 4)
+        if offset + size > packet_length:
+            offset = 28
+        params.append(Parameter(sl_no=i + 1, name=f"param_{i}", packet_id=i % packets_per_record, offset=offset,
+                                dtype="bit" if digital else "float", waveform=waveform or WAVEFORMS[i % 5],
+                                freq=0.1 + i % 7, phase=0.01 * i, samples_per_500ms=5 if minor else 1,
+                                bit_width=(8, 16, 32)[i % 3], noise_type=("uniform", "gaussian", "band_limited")[i % 3],
+                                start_time=-100.0 if i % 4 == 0 else None, end_time=1e6 if i % 4 == 0 else None))
+        if i % packets_per_record == packets_per_record - 1:
+            offset += size
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time SeedingEngine.seed_records against seed_record and check "
+                                                 "that both produce the same bytes")
+    parser.add_argument("--params", type=int, default=10000, help="Number of parameters")
+    parser.add_argument("--records", type=int, default=500, help="Records to generate")
+    parser.add_argument("--waveform", choices=WAVEFORMS, help="Use one waveform for every parameter (default: a mix)")
+    parser.add_argument("--hz", type=float, default=50.0, help="Record rate")
+    parser.add_argument("--packet_length", type=int, default=1400, help="Packet length in bytes")
+    parser.add_argument("--packets_per_record", type=int, default=10, help="Packets per record")
+    args = parser.parse_args()
+
+    time_increment = 1.0 / args.hz
+    record_times = -900.0 + np.arange(args.records) * time_increment
+    params = make_params(args.params, args.waveform, args.packet_length, args.packets_per_record)
+
+    batch_engine = SeedingEngine(args.packet_length, args.packets_per_record, noise_seed=1)
+    single_engine = SeedingEngine(args.packet_length, args.packets_per_record, reuse_records=True, noise_seed=1)
+    # Plans are compiled outside the timed runs
+    batch_engine.plan_for(params)
+    single_engine.plan_for(params)
+
+    started = time.perf_counter()
+    batch = batch_engine.seed_records(params, record_times, time_increment=time_increment)
+    batch_s = time.perf_counter() - started
+
+    single = np.empty_like(batch)
+    started = time.perf_counter()
+    for i, record_time in enumerate(record_times):
+        buffer = single_engine.seed_record(params, record_time, time_increment=time_increment)
+        single[i] = np.frombuffer(buffer.data, dtype=np.uint8).reshape(single.shape[1:])
+    single_s = time.perf_counter() - started
+
+    n = args.records
+    print(f"{args.params} parameters, {n} records of {batch.shape[1]} x {batch.shape[2]} bytes")
+    print(f"  seed_records: {batch_s * 1e3 / n:.3f} ms/record")
+    print(f"  seed_record:  {single_s * 1e3 / n:.3f} ms/record ({single_s / batch_s:.2f}x the batch time)")
+    mismatched = np.flatnonzero((batch != single).reshape(n, -1).any(axis=1))
+    if len(mismatched):
+        print(f"  {len(mismatched)} records differ, first at t = {record_times[mismatched[0]]}", file=sys.stderr)
+        sys.exit(1)
+    print("  identical bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+# Run from the scripts directory: make the project's core package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.capture_index import CaptureIndex, index_path_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the record/offset/timestamp index sidecar of a capture "
+                                                 "and look up records by time")
+    parser.add_argument("capture", help="Capture file (listener received.dat or a recorded .dat)")
+    parser.add_argument("--packet_length", type=int, default=1400, help="Packet length in bytes")
+    parser.add_argument("--packets_per_record", type=int, default=10, help="Packets per record")
+    parser.add_argument("--time_field_offset", type=int, default=24, help="Absolute time offset in packet 0")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the sidecar even if it is up to date")
+    parser.add_argument("--find", type=float, action="append", default=[], metavar="T",
+                        help="Print the first record with timestamp >= T (repeatable)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        if args.rebuild:
+            index = CaptureIndex.build(args.capture, args.packet_length, args.packets_per_record,
+                                       args.time_field_offset)
+            index.save(index_path_for(args.capture))
+        else:
+            index = CaptureIndex.open(args.capture, args.packet_length, args.packets_per_record,
+                                      args.time_field_offset)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    if len(index):
+        print(f"{index_path_for(args.capture)}: {len(index)} records, t = {index.times.min():.3f} .. "
+              f"{index.times.max():.3f} s ({elapsed:.2f} s)")
+    else:
+        print(f"{index_path_for(args.capture)}: no complete records")
+
+    for t in args.find:
+        k = index.find(t)
+        if k < len(index):
+            print(f"t >= {t}: record {k} at byte {int(index.offsets[k])}, t = {float(index.times[k]):.3f}")
+        else:
+            print(f"t >= {t}: no record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import asyncio
+import time
+from core.async_pipeline import AsyncRecordStream, open_destinations
+
+class AsyncPipelineThread(QThread):
+    """Runs an AsyncRecordStream on a private asyncio loop and bridges it to Qt.
+
+    Offers the same signals and controls as SeederThread, so MainWindow can use it
+    in place of the SeederThread/SenderThread pair. Control calls made from the
+    GUI thread are forwarded to the loop with call_soon_threadsafe.
+    """
+    record_ready = pyqtSignal(int, float, list)  # record_idx, record_time, packets
+    record_sent = pyqtSignal(int, float)  # record_idx, send_time
+    error = pyqtSignal(str)
+
+    def __init__(self, params_getter, seeding_engine, destinations, dat_buffer=None,
+                 start_time=-900.0, end_time=1200.0, hz=2.0, catch_up="burst"):
+        super().__init__()
+        self.destinations = list(destinations)
+        self.loop = None
+        self.stream = AsyncRecordStream(params_getter, seeding_engine, dat_buffer=dat_buffer, start_time=start_time,
+                                        end_time=end_time, hz=hz, catch_up=catch_up, on_error=self.error.emit)
+        self.stream.add_observer(self._on_record)
+
+    def _on_record(self, record_idx, record_time, packets):
+        self.record_sent.emit(record_idx, time.time())
+        self.record_ready.emit(record_idx, record_time, packets)
+
+    async def _main(self):
+        try:
+            self.stream.senders = await open_destinations(self.destinations)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        try:
+            await self.stream.run()
+        finally:
+            for sender in self.stream.senders:
+                sender.close()
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.loop.close()
+
+    def _call(self, func, *args):
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(func, *args)
+        else:
+            func(*args)
+
+    def pause(self):
+        self._call(self.stream.pause)
+
+    def resume(self):
+        self._call(self.stream.resume)
+
+    def stop(self):
+        self._call(self.stream.stop)
+        self.quit()
+        self.wait()
+
+    def set_hz(self, hz: float):
+        """Update the transmission rate (records per second)."""
+        try:
+            hz_value = float(hz)
+        except Exception:
+            # Keep previous Hz if conversion fails
+            return
+        self._call(self.stream.set_hz, hz_value)
+
+    def set_catch_up(self, policy: str):
+        self._call(self.stream.set_catch_up, policy)
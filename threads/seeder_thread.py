@@ -1,20 +1,24 @@
 from PyQt5.QtCore import QThread, pyqtSignal
-import time
 import threading
+from utils.time_utils import DeadlineScheduler
 
 class SeederThread(QThread):
     record_ready = pyqtSignal(int, float, list)  # record_idx, record_time, packets
     error = pyqtSignal(str)
     
-    def __init__(self, params_getter, seeding_engine, dat_buffer=None, start_time=-900.0, end_time=1200.0, hz=2.0):
+    def __init__(self, params_getter, seeding_engine, dat_buffer=None, start_time=-900.0, end_time=1200.0, hz=2.0,
+                 catch_up="burst"):
         super().__init__()
         self.params_getter = params_getter
         self.seeding_engine = seeding_engine
         self.dat_buffer = dat_buffer
         self.start_time = start_time
         self.end_time = end_time
-        self.hz = hz
+        # Zero or negative rates fall back to 1 Hz, as in set_hz
+        self.hz = hz if hz > 0 else 1.0
         self.running = False
+        # Absolute-deadline pacing; catch_up is "burst", "skip" or "stretch"
+        self.scheduler = DeadlineScheduler(self.hz, policy=catch_up)
         # Use Event for pause/resume semantics (set = running, clear = paused)
         self.pause_event = threading.Event()
         self.pause_event.set()
@@ -23,22 +27,29 @@ class SeederThread(QThread):
         self.running = True
         current_time = self.start_time
         record_idx = 0
+        self.scheduler.reset()
         
         while self.running and current_time <= self.end_time:
-            # Block here when paused; returns immediately when event is set
-            self.pause_event.wait()
+            if not self.pause_event.is_set():
+                # Block while paused, then restart the schedule rather than bursting to catch up
+                self.pause_event.wait()
+                self.scheduler.reset()
+                continue
             try:
                 # Compute time increment dynamically so runtime Hz changes take effect
-                time_increment = 1.0 / self.hz if self.hz != 0 else 0.0
+                time_increment = 1.0 / self.hz
+                # Wait for this record's deadline; generation time is not added to the period
+                steps = self.scheduler.wait()
+                if steps > 1:
+                    # Skip policy dropped missed slots: advance simulated time past them
+                    current_time += (steps - 1) * time_increment
+                    if current_time > self.end_time:
+                        break
                 buffer = self.seeding_engine.seed_record(self.params_getter(), current_time, self.dat_buffer, time_increment)
                 packets = buffer.get_packets()
                 self.record_ready.emit(record_idx, current_time, packets)
                 record_idx += 1
                 
-                # Sleep for the transmission interval
-                sleep_time = time_increment
-                time.sleep(sleep_time)
-                
                 # Advance time by the increment (1 second for 1Hz, 0.2 seconds for 5Hz, etc.)
                 current_time += time_increment
                 
@@ -66,6 +77,11 @@ class SeederThread(QThread):
             if hz_value <= 0:
                 hz_value = 1.0
             self.hz = hz_value
+            self.scheduler.set_hz(hz_value)
         except Exception:
             # Keep previous Hz if conversion fails
-            pass
\ No newline at end of file
+            pass
+
+    def set_catch_up(self, policy: str):
+        """Choose how the seeder recovers when it falls behind: burst, skip or stretch."""
+        self.scheduler.set_policy(policy)
\ No newline at end of file
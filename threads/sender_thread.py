@@ -1,30 +1,45 @@
 from PyQt5.QtCore import QThread, pyqtSignal
-import socket
 import time
 import threading
-from queue import Queue
+from queue import Queue, Empty
+from core.multicast_sender import MulticastSender
 
 class SenderThread(QThread):
-    packet_sent = pyqtSignal(int, float)
-    record_sent = pyqtSignal(int, float)
+    record_sent = pyqtSignal(int, float)  # last record_idx of a batch, send_time
+    batch_sent = pyqtSignal(int, int, int)  # records, packets, bytes in the batch
     bytes_sent_signal = pyqtSignal(int)
     error = pyqtSignal(str)
 
-    def __init__(self, group="127.0.0.1", port=12345, ttl=1):
+    def __init__(self, group="127.0.0.1", port=12345, ttl=1, batch=True, max_batch_records=32, interface="0.0.0.0",
+                 inter_packet_delay_ms=0.0):
         super().__init__()
         self.group = group
         self.port = port
         self.ttl = ttl
-        self.sock = None
+        self.interface = interface
+        # Per-destination pacing; a non-zero delay sends packet by packet instead of batching
+        self.inter_packet_delay_ms = inter_packet_delay_ms
+        self.batch = batch
+        self.max_batch_records = max(1, int(max_batch_records))
+        self.sender = None
+        # Counters are updated once per batch instead of signalling every packet
         self.total_bytes = 0
+        self.records_sent = 0
+        self.packets_sent = 0
+        self.batches_sent = 0
         self.queue = Queue(maxsize=100)
         # Use Event for pause/resume semantics (set = running, clear = paused)
         self.pause_event = threading.Event()
         self.pause_event.set()
 
     def configure_socket(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.ttl)
+        self.sender = MulticastSender(self.group, int(self.port), self.ttl, self.interface, batch=self.batch)
+
+    @classmethod
+    def for_destination(cls, destination, **kwargs):
+        """SenderThread for a core.models.Destination."""
+        return cls(group=destination.group, port=destination.port, ttl=destination.ttl,
+                   interface=destination.interface, inter_packet_delay_ms=destination.inter_packet_delay_ms, **kwargs)
 
     def enqueue(self, record_idx, record_time, packets):
         try:
@@ -32,31 +47,56 @@ class SenderThread(QThread):
         except Exception as e:
             self.error.emit(str(e))
 
+    def _next_batch(self, first):
+        """Drain up to max_batch_records queued records behind first without blocking."""
+        batch = [first]
+        stop = False
+        while len(batch) < self.max_batch_records:
+            try:
+                item = self.queue.get_nowait()
+            except Empty:
+                break
+            self.queue.task_done()
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
     def run(self):
         self.running = True
         self.configure_socket()
         while self.running:
             try:
                 item = self.queue.get(timeout=0.1)
-            except Exception:
+            except Empty:
                 continue
             if item is None:
                 break
             # Ensure we respect pause
             self.pause_event.wait()
-            record_idx, packets = item
-            bytes_sent = 0
-            for i, pkt in enumerate(packets):
-                try:
-                    self.sock.sendto(pkt, (self.group, int(self.port)))
-                    bytes_sent += len(pkt)
-                    self.packet_sent.emit(i, time.time())
-                except Exception as e:
-                    self.error.emit(str(e))
+            batch, stop = self._next_batch(item)
+            packets = [pkt for _, record_packets in batch for pkt in record_packets]
+            try:
+                if self.inter_packet_delay_ms > 0:
+                    bytes_sent = self.sender.send_packets(packets, self.inter_packet_delay_ms)
+                else:
+                    bytes_sent = self.sender.send_batch(packets)
+            except Exception as e:
+                self.error.emit(str(e))
+                bytes_sent = 0
+            else:
+                self.records_sent += len(batch)
+                self.packets_sent += len(packets)
+                self.batches_sent += 1
             self.total_bytes += bytes_sent
             self.bytes_sent_signal.emit(self.total_bytes)
-            self.record_sent.emit(record_idx, time.time())
+            self.batch_sent.emit(len(batch), len(packets), bytes_sent)
+            self.record_sent.emit(batch[-1][0], time.time())
             self.queue.task_done()
+            if stop:
+                break
+        self.sender.close()
 
     def pause(self):
         self.pause_event.clear()
@@ -6,4 +6,17 @@ class WorkerSignals(QObject):
     record_sent = pyqtSignal(int)  # record_idx
     sample_generated = pyqtSignal(str, float, float)  # param_name, sample_time, value
     error = pyqtSignal(str)
-    log_message = pyqtSignal(str, str)  # message, level (INFO/WARNING/ERROR)
\ No newline at end of file
+    log_message = pyqtSignal(str, str)  # message, level (INFO/WARNING/ERROR)
+
+class EngineSignals(QObject):
+    """Qt adapter for a SeedingEngine: re-emits each record's sample block as one signal."""
+    samples_generated = pyqtSignal(float, object)  # record_time, core.seed_plan.SampleBlock
+
+    def __init__(self, seeding_engine):
+        super().__init__()
+        self.seeding_engine = seeding_engine
+        seeding_engine.add_observer(self._on_samples)
+
+    def _on_samples(self, record_time, samples):
+        # Called from the generating thread; queued connections deliver it to the GUI thread
+        self.samples_generated.emit(record_time, samples)
@@ -1,4 +1,5 @@
 import json
+import os
 from core.models import Parameter
 
 class ConfigManager:
@@ -14,4 +15,9 @@ class ConfigManager:
         with open(filepath, "r") as f:
             config = json.load(f)
         params = [Parameter.from_dict(p) for p in config["parameters"]]
+        # Relative sample files are relative to the config file
+        base_dir = os.path.dirname(os.path.abspath(filepath))
+        for p in params:
+            if p.sample_file and not os.path.isabs(p.sample_file):
+                p.sample_file = os.path.join(base_dir, p.sample_file)
         return config.get("simulation_settings", {}), params
@@ -1,6 +1,9 @@
 import csv
 import struct
 from core.models import Parameter
+from utils.log import get_logger
+
+log = get_logger("io")
 
 def load_parameters_from_file(filename):
     if filename.endswith('.csv'):
@@ -40,9 +43,9 @@ def load_parameters_from_csv(filename):
                 )
                 params.append(param)
             except KeyError as e:
-                print(f"Missing field in CSV: {e}")
+                log.warning("Missing field in CSV: %s", e)
             except ValueError as e:
-                print(f"Invalid value in CSV: {e}")
+                log.warning("Invalid value in CSV: %s", e)
     return params
 
 def load_parameters_from_binary(filename):
@@ -0,0 +1,143 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+ROOT = "simisro"
+DEFAULT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+DEFAULT_RATE = 20  # Records per category and message per RATE_WINDOW seconds
+RATE_WINDOW = 1.0
+
+def get_logger(category):
+    """Logger for one category, e.g. "gui.plot". A level set on "gui" also applies to
+    "gui.plot" unless that category has its own. Pass arguments instead of pre-formatting
+    (log.debug("x=%s", x)) so disabled levels cost no string building."""
+    return logging.getLogger(f"{ROOT}.{category}")
+
+def set_level(category, level):
+    """Set the level of a category (None or "" for every category)."""
+    logging.getLogger(f"{ROOT}.{category}" if category else ROOT).setLevel(_level(level))
+
+def _level(level):
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return value
+
+def parse_levels(spec):
+    """Parse "INFO,gui.plot=DEBUG,console=WARNING" into {category: level}; a bare level
+    applies to every category ("") and "console" is the stderr handler's level."""
+    levels = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        category, _, level = item.rpartition("=")
+        levels[category.strip()] = _level(level.strip())
+    return levels
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most `rate` records per `window` seconds for each logger and message
+    template. The next record let through carries the number suppressed in
+    record.suppressed (shown by SuppressedFormatter); the record itself is shared
+    with other handlers, so its message is left alone."""
+
+    def __init__(self, rate=DEFAULT_RATE, window=RATE_WINDOW, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets = {}  # (logger, template) -> [window_start, passed, suppressed]
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or now - bucket[0] >= self.window:
+                suppressed = bucket[2] if bucket is not None else 0
+                bucket = self._buckets[key] = [now, 0, 0]
+            else:
+                suppressed = 0
+            if bucket[1] >= self.rate:
+                bucket[2] += 1
+                return False
+            bucket[1] += 1
+        # Set on every pass: each handler runs its own filter just before formatting
+        record.suppressed = suppressed
+        return True
+
+
+class SuppressedFormatter(logging.Formatter):
+    """Formatter that appends RateLimitFilter's suppressed count to the message."""
+
+    def formatMessage(self, record):
+        text = super().formatMessage(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} ({suppressed} similar messages suppressed)" if suppressed else text
+
+
+class RingLogHandler(logging.Handler):
+    """Keeps the last `capacity` formatted records for a GUI log view.
+
+    emit() may be called from any thread; the view drains pending records on its
+    own schedule (once per frame), so logging never touches widgets directly.
+    """
+
+    def __init__(self, capacity=2000, level=logging.DEBUG):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)  # (levelno, text), oldest first
+        self._pending = deque(maxlen=capacity)
+        self.setFormatter(SuppressedFormatter("%(asctime)s %(message)s", "%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            entry = (record.levelno, self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        self.records.append(entry)
+        self._pending.append(entry)
+
+    def drain(self):
+        """Records emitted since the last drain, oldest first."""
+        entries = []
+        while True:
+            try:
+                entries.append(self._pending.popleft())
+            except IndexError:
+                return entries
+
+
+def configure(spec="", stream=None, rate=DEFAULT_RATE):
+    """Set category levels from a parse_levels() spec and add a rate-limited stderr
+    handler (WARNING and above unless the spec sets "console"). Every category
+    defaults to INFO. Returns the stderr handler."""
+    levels = parse_levels(spec)
+    root = logging.getLogger(ROOT)
+    root.setLevel(levels.pop("", logging.INFO))
+    console_level = levels.pop("console", logging.WARNING)
+    for category, level in levels.items():
+        set_level(category, level)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setLevel(console_level)
+    handler.setFormatter(SuppressedFormatter(DEFAULT_FORMAT))
+    handler.addFilter(RateLimitFilter(rate))
+    root.addHandler(handler)
+    root.propagate = False
+    return handler
+
+def add_handler(handler, rate=DEFAULT_RATE):
+    """Attach a handler (e.g. a RingLogHandler) to every category, rate limited. Give it a
+    SuppressedFormatter to show how many records were dropped."""
+    handler.addFilter(RateLimitFilter(rate))
+    root = logging.getLogger(ROOT)
+    if root.level == logging.NOTSET:
+        root.setLevel(logging.INFO)
+    root.addHandler(handler)
+    return handler
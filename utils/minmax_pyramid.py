@@ -0,0 +1,118 @@
+import numpy as np
+from utils.ring_buffer import RingBuffer
+
+class MinMaxPyramid:
+    """Multi-resolution min/max history of one plot curve.
+
+    Level 0 holds the raw samples. Each bucket of level L summarises `factor`
+    consecutive items of level L - 1 by its minimum and maximum and the times
+    they occurred at, so level L spans factor**L samples per bucket. Every
+    level is a fixed-capacity RingBuffer and buckets are completed as samples
+    arrive, so memory is bounded while coarse levels reach back hours.
+
+    points() picks the finest level that covers the requested time range within
+    a point budget (normally the plot's pixel width), making the draw cost per
+    frame independent of how long the range is.
+    """
+
+    def __init__(self, factor=4, levels=8, raw_capacity=4096, level_capacity=1024):
+        self.factor = int(factor)
+        self.levels = int(levels)
+        self.raw = RingBuffer(raw_capacity)
+        # Level L >= 1: (time, value) of each bucket's minimum and of its maximum
+        self.mins = [None] + [RingBuffer(level_capacity) for _ in range(self.levels - 1)]
+        self.maxs = [None] + [RingBuffer(level_capacity) for _ in range(self.levels - 1)]
+
+    def __len__(self):
+        return len(self.raw)
+
+    def clear(self):
+        self.raw.clear()
+        for level in range(1, self.levels):
+            self.mins[level].clear()
+            self.maxs[level].clear()
+
+    def extend(self, t, y):
+        """Append samples (in time order) and complete any buckets they fill."""
+        t = np.asarray(t, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        # Chunked so every lower-level item a new bucket needs is still retained
+        chunk = self.raw.capacity if self.levels == 1 else max(1, min(self.raw.capacity, self.mins[1].capacity) // 2)
+        for start in range(0, len(t), chunk):
+            self.raw.extend(t[start:start + chunk], y[start:start + chunk])
+            for level in range(1, self.levels):
+                if not self._complete(level):
+                    break
+
+    def _total(self, level):
+        return self.raw.total if level == 0 else self.mins[level].total
+
+    def _items(self, level):
+        """Views (tmin, ymin, tmax, ymax) of the retained items of a level, oldest first."""
+        if level == 0:
+            t, y = self.raw.times(), self.raw.values()
+            return t, y, t, y
+        return self.mins[level].times(), self.mins[level].values(), self.maxs[level].times(), self.maxs[level].values()
+
+    def _complete(self, level):
+        """Build the level's buckets that the level below has filled; returns how many."""
+        first = self._total(level)
+        lower_total = self._total(level - 1)
+        last = lower_total // self.factor
+        if last <= first:
+            return 0
+        tmin, ymin, tmax, ymax = self._items(level - 1)
+        offset = first * self.factor - (lower_total - len(tmin))
+        stop = offset + (last - first) * self.factor
+        shape = (last - first, self.factor)
+        tmin, ymin = tmin[offset:stop].reshape(shape), ymin[offset:stop].reshape(shape)
+        tmax, ymax = tmax[offset:stop].reshape(shape), ymax[offset:stop].reshape(shape)
+        rows = np.arange(shape[0])
+        lo = np.argmin(ymin, axis=1)
+        hi = np.argmax(ymax, axis=1)
+        self.mins[level].extend(tmin[rows, lo], ymin[rows, lo])
+        self.maxs[level].extend(tmax[rows, hi], ymax[rows, hi])
+        return shape[0]
+
+    def _covers(self, level, x0):
+        items = self._items(level)[0]
+        return self._total(level) <= len(items) or (len(items) and items[0] <= x0)
+
+    def level_for(self, x0, x1, budget):
+        """Finest level holding the range [x0, x1] in at most budget items."""
+        for level in range(self.levels):
+            tmin, _, tmax, _ = self._items(level)
+            count = np.searchsorted(tmin, x1, side='right') - np.searchsorted(tmax, x0, side='left')
+            if count <= budget and self._covers(level, x0):
+                return level
+        return self.levels - 1
+
+    def points(self, x0, x1, budget):
+        """Return (t, y, level): the points to draw for [x0, x1], at most about 2 * budget.
+
+        Buckets contribute their minimum and maximum in time order. Samples newer
+        than the level's last complete bucket come from the finer levels.
+        """
+        level = self.level_for(x0, x1, budget)
+        tmin, ymin, tmax, ymax = self._items(level)
+        # One item either side of the range so the line runs to the edges
+        i0 = max(0, int(np.searchsorted(tmax, x0, side='left')) - 1)
+        i1 = int(np.searchsorted(tmin, x1, side='right')) + 1
+        parts = [(tmin[i0:i1], ymin[i0:i1], tmax[i0:i1], ymax[i0:i1])]
+        if i1 >= len(tmin):
+            for finer in range(level - 1, -1, -1):
+                items = self._items(finer)
+                start = self._total(finer + 1) * self.factor - (self._total(finer) - len(items[0]))
+                parts.append(tuple(a[max(0, start):] for a in items))
+        tmin, ymin, tmax, ymax = (np.concatenate(a) for a in zip(*parts))
+        if level == 0 and len(parts) == 1:
+            return tmin, ymin, level
+        # Interleave each item's extremes in the order they occurred
+        first_min = tmin <= tmax
+        t = np.empty(2 * len(tmin))
+        y = np.empty(2 * len(tmin))
+        t[0::2] = np.where(first_min, tmin, tmax)
+        t[1::2] = np.where(first_min, tmax, tmin)
+        y[0::2] = np.where(first_min, ymin, ymax)
+        y[1::2] = np.where(first_min, ymax, ymin)
+        return t, y, level
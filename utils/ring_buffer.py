@@ -0,0 +1,53 @@
+import numpy as np
+
+class RingBuffer:
+    """Fixed-capacity (time, value) history for one plot curve.
+
+    Every sample is stored twice, at i and i + capacity, so the retained samples
+    are always one contiguous slice: times()/values() return views that can be
+    handed to pyqtgraph without copying. Appending and pruning are index
+    arithmetic only.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = int(capacity)
+        self._t = np.zeros(2 * self.capacity)
+        self._y = np.zeros(2 * self.capacity)
+        self.total = 0  # Samples ever appended
+        self.size = 0  # Samples currently retained
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, t, y):
+        """Append samples; the oldest ones are overwritten once capacity is reached."""
+        t = np.asarray(t, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        n = len(t)
+        if n > self.capacity:
+            t, y = t[-self.capacity:], y[-self.capacity:]
+            self.total += n - self.capacity
+            n = self.capacity
+        idx = (self.total + np.arange(n)) % self.capacity
+        self._t[idx] = t
+        self._t[idx + self.capacity] = t
+        self._y[idx] = y
+        self._y[idx + self.capacity] = y
+        self.total += n
+        self.size = min(self.size + n, self.capacity)
+
+    def _span(self):
+        end = self.total % self.capacity + self.capacity
+        return end - self.size, end
+
+    def times(self):
+        start, end = self._span()
+        return self._t[start:end]
+
+    def values(self):
+        start, end = self._span()
+        return self._y[start:end]
+
+    def clear(self):
+        self.total = 0
+        self.size = 0
@@ -4,4 +4,94 @@ def get_current_epoch():
     return time.time()
 
 def seconds_to_epoch(seconds):
-    return time.time() + seconds
\ No newline at end of file
+    return time.time() + seconds
+
+CATCH_UP_POLICIES = ("burst", "skip", "stretch")
+
+class DeadlineScheduler:
+    """Paces a loop against absolute deadlines on a monotonic clock.
+
+    Each deadline is the previous one plus one period, so time spent generating
+    and emitting a record does not add to the period and the long-run rate does
+    not drift. wait() sleeps until shortly before the deadline and spins for the
+    rest, which holds sub-millisecond jitter at high rates.
+
+    When a deadline has already passed the catch-up policy decides what happens:
+      burst   - keep the schedule; late records run back to back until caught up
+                (at most max_burst periods behind, one second's worth by default,
+                after which it restarts from now)
+      skip    - drop the missed slots; wait() returns how many periods to advance
+      stretch - restart the schedule from now; the stream slips instead of catching up
+    """
+
+    def __init__(self, hz, policy="burst", spin_threshold=0.002, max_burst=None, clock=time.perf_counter):
+        self._max_burst = max_burst  # None: one second of periods at the current rate
+        self.set_hz(hz)
+        self.set_policy(policy)
+        self.spin_threshold = spin_threshold
+        self.clock = clock
+        self.reset()
+
+    def set_hz(self, hz):
+        self.period = 1.0 / float(hz)
+        self.max_burst = self._max_burst if self._max_burst is not None else max(1, round(float(hz)))
+
+    def set_policy(self, policy):
+        if policy not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {policy}")
+        self.policy = policy
+
+    def reset(self):
+        """Restart the schedule; the next wait() returns immediately (e.g. after a pause)."""
+        self._last = None
+        self.late_count = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+
+    def wait(self):
+        """Block until the next slot is due. Returns the number of periods it advances
+        (1, or more when the skip policy dropped missed slots)."""
+        steps, deadline = self.advance()
+        if deadline is not None:
+            self._sleep_until(deadline)
+        return steps
+
+    def advance(self):
+        """Claim the next slot without blocking, for callers that wait themselves
+        (e.g. an asyncio loop). Returns (steps, deadline); deadline is the clock time
+        to wait for, or None when the slot is already due."""
+        now = self.clock()
+        if self._last is None:
+            self._last = now
+            return 1, None
+        target = self._last + self.period
+        late = now - target
+        steps = 1
+        deadline = None
+        if late >= 0:
+            self.late_count += 1
+            self.max_lateness = max(self.max_lateness, late)
+            if self.policy == "skip":
+                missed = int(late // self.period)
+                steps += missed
+                self.skipped += missed
+                target += missed * self.period
+            elif self.policy == "stretch":
+                target = now
+            elif late > self.max_burst * self.period:
+                target = now
+        else:
+            deadline = target
+        self._last = target
+        return steps, deadline
+
+    def _sleep_until(self, target):
+        while True:
+            remaining = target - self.clock()
+            if remaining <= 0:
+                return
+            if remaining > self.spin_threshold:
+                time.sleep(remaining - self.spin_threshold)
+            else:
+                # Spin for the last stretch; sleep(0) yields the GIL to other threads
+                time.sleep(0)